@@ -65,6 +65,14 @@ mask_pockets_inds = mask_pockets.astype(bool)
 lab = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2LAB)
 L_orig, A_orig, B_orig = cv2.split(lab)
 
+# Working buffers, allocated once and reused for every colour-way
+L = np.empty_like(L_orig)
+A = np.empty_like(A_orig)
+B = np.empty_like(B_orig)
+lab_coloured = np.empty_like(lab)
+lab_bgr      = np.empty_like(img_bgr)
+out_bgr      = np.empty_like(img_bgr)
+
 # ---------------------------------------------------------
 # Read colour combinations
 # ---------------------------------------------------------
@@ -88,10 +96,10 @@ for row in combos:
     body_lab        = cv2.cvtColor(body_bgr,    cv2.COLOR_BGR2LAB)[0,0]
     pockets_lab     = cv2.cvtColor(pockets_bgr, cv2.COLOR_BGR2LAB)[0,0]
 
-    # Clone original LAB channels to work on
-    L = L_orig.copy()
-    A = A_orig.copy()
-    B = B_orig.copy()
+    # Reset working LAB channels from the original
+    np.copyto(L, L_orig)
+    np.copyto(A, A_orig)
+    np.copyto(B, B_orig)
 
     # -------- Body region: change hue/sat only --------
     A[mask_body_inds] = body_lab[1]
@@ -112,9 +120,9 @@ for row in combos:
         ).astype(np.uint8)
 
     # -------- Merge & convert back --------
-    lab_coloured = cv2.merge([L, A, B])
-    out_bgr      = cv2.cvtColor(lab_coloured, cv2.COLOR_LAB2BGR)
-    out_bgr      = cv2.cvtColor(out_bgr, cv2.COLOR_BGR2RGB)
+    cv2.merge([L, A, B], lab_coloured)
+    cv2.cvtColor(lab_coloured, cv2.COLOR_LAB2BGR, dst=lab_bgr)
+    cv2.cvtColor(lab_bgr, cv2.COLOR_BGR2RGB, dst=out_bgr)
 
     # -------- Save --------
     #out_webp = os.path.join(OUTPUT_DIR, f"{file_base}_v2.webp")
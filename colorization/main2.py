@@ -4,6 +4,7 @@ import cv2
 import numpy as np
 import pandas as pd
 import os
+from functools import lru_cache
 from PIL import Image, ImageEnhance
 from skimage import color
 
@@ -14,6 +15,12 @@ def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
+@lru_cache(maxsize=None)
+def rgb_to_lab(rgb_color):
+    """Convert an RGB tuple to LAB, cached since CSV rows repeat colors"""
+    target_rgb_norm = np.array(rgb_color).reshape(1, 1, 3) / 255.0
+    return color.rgb2lab(target_rgb_norm)[0, 0]
+
 def apply_color_to_region(image, mask, target_color, method='lab_colorize'):
     """Apply color to specific region defined by mask while preserving luminosity"""
     if target_color is None:
@@ -38,14 +45,14 @@ def apply_color_to_region(image, mask, target_color, method='lab_colorize'):
         # Convert RGB to LAB color space
         lab_image = color.rgb2lab(img_array)
         
-        # Convert target color to LAB
-        target_rgb_norm = np.array(target_color).reshape(1, 1, 3) / 255.0
-        target_lab = color.rgb2lab(target_rgb_norm)[0, 0]
+        # Convert target color to LAB (memoized per unique color)
+        target_lab = rgb_to_lab(tuple(target_color))
         
         print(f"  Target color LAB: L={target_lab[0]:.1f}, A={target_lab[1]:.1f}, B={target_lab[2]:.1f}")
         
-        # Apply color only to A and B channels, preserve L (luminance)
-        result_lab = lab_image.copy()
+        # Apply color only to A and B channels, preserve L (luminance).
+        # rgb2lab already returned a fresh array, so update it in place.
+        result_lab = lab_image
         
         # Smoothly blend A and B channels while keeping original luminance
         blend_strength = 0.9
@@ -70,7 +77,8 @@ def apply_color_to_region(image, mask, target_color, method='lab_colorize'):
         target_rgb_norm = np.array(target_color).reshape(1, 1, 3) / 255.0
         target_hsv = color.rgb2hsv(target_rgb_norm)[0, 0]
         
-        result_hsv = hsv_image.copy()
+        # rgb2hsv already returned a fresh array, so update it in place
+        result_hsv = hsv_image
         
         # Apply target hue and saturation, preserve value (brightness)
         blend_strength = 0.7
@@ -100,8 +108,9 @@ def apply_color_to_region(image, mask, target_color, method='lab_colorize'):
             )
     
     # Convert back to 0-255 range and ensure valid values
-    result_rgb = np.clip(result_rgb, 0, 1)
-    result_uint8 = (result_rgb * 255).astype(np.uint8)
+    np.clip(result_rgb, 0, 1, out=result_rgb)
+    result_rgb *= 255
+    result_uint8 = result_rgb.astype(np.uint8)
     
     # Check if any pixels were actually changed
     changes = np.sum(np.abs(result_uint8 - (img_array * 255).astype(np.uint8)) > 1)
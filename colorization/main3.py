@@ -2,6 +2,7 @@ import cv2
 import numpy as np
 import pandas as pd
 import os
+from functools import lru_cache
 from PIL import Image, ImageEnhance
 from skimage import color
 import cv2.cuda
@@ -17,6 +18,13 @@ def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
+@lru_cache(maxsize=None)
+def rgb_to_lab(rgb_color):
+    """Convert an RGB tuple to LAB, cached since CSV rows repeat colors"""
+    target_color_rgb_normalized = np.array(rgb_color).astype(np.float32) / 255.0
+    # Expand dimensions to (1,1,3) for color.rgb2lab to treat it as a single pixel color
+    return color.rgb2lab(target_color_rgb_normalized[np.newaxis, np.newaxis, :])[0, 0, :]
+
 def apply_color_to_region(image, mask, target_color, method='lab_colorize'):
     """Apply color to specific region defined by mask while preserving luminosity"""
     if target_color is None:
@@ -38,29 +46,21 @@ def apply_color_to_region(image, mask, target_color, method='lab_colorize'):
         # Convert original image to LAB color space
         lab_image = color.rgb2lab(img_array)
 
-        # Convert target color to LAB
-        target_color_rgb_normalized = np.array(target_color).astype(np.float32) / 255.0
-        # Expand dimensions to (1,1,3) for color.rgb2lab to treat it as a single pixel color
-        target_lab = color.rgb2lab(target_color_rgb_normalized[np.newaxis, np.newaxis, :])[0, 0, :]
-
-        # Extract L, A, B channels
-        L_channel = lab_image[:, :, 0]
-        A_channel = lab_image[:, :, 1]
-        B_channel = lab_image[:, :, 2]
+        # Convert target color to LAB (memoized per unique color)
+        target_lab = rgb_to_lab(tuple(target_color))
 
         # Apply the target color's A and B channels to the masked region
-        # while preserving the original L channel
-        A_channel[color_mask] = target_lab[1]
-        B_channel[color_mask] = target_lab[2]
-
-        # Recombine LAB channels
-        colorized_lab_image = np.stack([L_channel, A_channel, B_channel], axis=-1)
+        # while preserving the original L channel. The channel views write
+        # straight into lab_image, so no recombination copy is needed.
+        lab_image[:, :, 1][color_mask] = target_lab[1]
+        lab_image[:, :, 2][color_mask] = target_lab[2]
 
         # Convert back to RGB
-        colorized_rgb_image = color.lab2rgb(colorized_lab_image)
+        colorized_rgb_image = color.lab2rgb(lab_image)
 
-        # Clip values to [0, 1] and convert back to 0-255 range for PIL
-        colorized_rgb_image = np.clip(colorized_rgb_image, 0, 1) * 255.0
+        # Clip values to [0, 1] and convert back to 0-255 range for PIL, in place
+        np.clip(colorized_rgb_image, 0, 1, out=colorized_rgb_image)
+        colorized_rgb_image *= 255.0
         return Image.fromarray(colorized_rgb_image.astype(np.uint8))
 
     return image # Return original image if method is not recognized
@@ -85,11 +85,10 @@ def process_image_variants(template_path, masks_data, csv_path, output_dir):
             print(f"Warning: Mask file not found for {part}: {mask_file}")
             masks[part] = None
 
-    for index, row in df.iterrows():
-        filename = row['filename']
-        body_color_hex = row['body_color']
-        pockets_color_hex = row['pockets_color']
-
+    # Iterate plain column arrays: iterrows() would build a pandas Series per row
+    for filename, body_color_hex, pockets_color_hex in zip(df['filename'].to_numpy(),
+                                                           df['body_color'].to_numpy(),
+                                                           df['pockets_color'].to_numpy()):
         print(f"\nProcessing {filename}...")
 
         current_image = base_image.copy()
@@ -2,111 +2,229 @@ import cv2
 import numpy as np
 import pandas as pd
 import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 
+# --- Alternative 1 tuning ---
+SAT_BOOST_FACTOR = 1.2 # Adjust this (e.g., 1.0 for no change, >1.0 for more saturation)
+VALUE_OFFSET = 0    # Adjust this (e.g., 0 for no change, >0 for brighter)
+
+# --- Alternative 2 tuning ---
+BLEND_ALPHA = 0.5 # 0.0 (more original) to 1.0 (more new color)
+
+# --- Output ---
+IMWRITE_THREADS = 2 # Background encoder threads per worker process
+ROWS_PER_TASK = 8 # Rows colorized (and their writes joined) per worker task
+
+_HEXRE = re.compile(r'[0-9A-Fa-f]{6}') # int(h, 16) alone would also accept '+', '_' and whitespace
+
+@lru_cache(maxsize=None)
 def hex_to_bgr(hex_color: str) -> tuple[int, int, int]:
     """
     Converts a hexadecimal color string (e.g., '#RRGGBB') to a BGR tuple.
     Returns (B, G, R) where each component is 0-255.
     """
     hex_color = hex_color.lstrip('#')
-    if not all(c in '0123456789abcdefABCDEF' for c in hex_color) or len(hex_color) != 6:
+    if not _HEXRE.fullmatch(hex_color):
         raise ValueError(f"Invalid hex color format: {hex_color}. Expected '#RRGGBB'.")
-    return tuple(int(hex_color[i:i+2], 16) for i in (4, 2, 0)) # BGR
+    value = int(hex_color, 16) # 0xRRGGBB, single C-level parse
+    return (value & 0xFF, (value >> 8) & 0xFF, (value >> 16) & 0xFF) # BGR
 
-def colorize_region_alternative(original_image_bgr: np.ndarray, region_mask_3ch: np.ndarray, target_hex_color: str, alternative_mode: int = 3) -> np.ndarray:
+@lru_cache(maxsize=None)
+def hex_to_hsv(hex_color: str) -> tuple[int, int, int]:
     """
-    Applies a target color to a specific region of an image based on the chosen alternative mode.
+    Converts a hexadecimal color string to an OpenCV HSV tuple.
+    Cached, since the same colors repeat across many CSV rows.
+    """
+    hsv = cv2.cvtColor(np.array([[hex_to_bgr(hex_color)]], dtype=np.uint8), cv2.COLOR_BGR2HSV)[0, 0]
+    return tuple(int(c) for c in hsv)
+
+@lru_cache(maxsize=None)
+def hex_to_lab(hex_color: str) -> tuple[int, int, int]:
+    """
+    Converts a hexadecimal color string to an OpenCV 8-bit Lab tuple.
+    Cached, since the same colors repeat across many CSV rows.
+    """
+    lab = cv2.cvtColor(np.array([[hex_to_bgr(hex_color)]], dtype=np.uint8), cv2.COLOR_BGR2Lab)[0, 0]
+    return tuple(int(c) for c in lab)
+
+def prepare_template(original_image_bgr: np.ndarray, alternative_mode: int = 3) -> tuple[np.ndarray, ...]:
+    """
+    Converts the template into the color space used by the chosen alternative mode.
+    The template is constant across CSV rows, so this runs once per image.
+    For modes 1 and 3 the interleaved HSV/Lab image doubles as a scratch buffer:
+    only the hue/chroma planes are refilled per color, the luminosity plane is kept.
 
     Args:
         original_image_bgr (np.ndarray): The original BGR image (template_img).
-        region_mask_3ch (np.ndarray): The 3-channel binary mask for the region to colorize.
+        alternative_mode (int): The alternative mode (1, 2, or 3), see colorize_region_alternative.
+
+    Returns:
+        tuple[np.ndarray, ...]: The prepared template channels:
+            1: (hsv_buf, bgr_buf)
+            2: (original_gray_3ch, gray_levels_scaled, bgr_buf)
+            3: (lab_buf, bgr_buf)
+    """
+    if original_image_bgr is None:
+        raise ValueError("Original BGR image cannot be None for colorization.")
+
+    if alternative_mode == 1:
+        # Convert original image to HSV
+        hsv_buf = cv2.cvtColor(original_image_bgr, cv2.COLOR_BGR2HSV)
+        # Use original V, but apply offset for brightness (same for every row)
+        hsv_buf[..., 2] = np.clip(hsv_buf[..., 2].astype(np.int16) + VALUE_OFFSET, 0, 255)
+        return hsv_buf, np.empty_like(original_image_bgr)
+
+    if alternative_mode == 2:
+        # Get grayscale version of original image (3 channels)
+        original_gray_3ch = cv2.cvtColor(cv2.cvtColor(original_image_bgr, cv2.COLOR_BGR2GRAY), cv2.COLOR_GRAY2BGR)
+        # The blend is linear, so the gray * (1 - alpha) term is the same for every row
+        gray_levels_scaled = np.arange(256, dtype=np.float32).reshape(256, 1, 1) * (1.0 - BLEND_ALPHA)
+        return original_gray_3ch, gray_levels_scaled, np.empty_like(original_image_bgr)
+
+    # Default or if alternative_mode == 3
+    lab_buf = cv2.cvtColor(original_image_bgr, cv2.COLOR_BGR2Lab)
+
+    # --- Enhancement to L_orig (Optional, adjust carefully) ---
+    # You can try simple scaling and offset, or more complex operations
+    # lab_buf[..., 0] = cv2.equalizeHist(lab_buf[..., 0]) # Example: Histogram equalization
+    # lab_buf[..., 0] = np.clip(lab_buf[..., 0] * 1.1 + 10, 0, 255).astype(np.uint8) # Example: Brightness/Contrast
+    # Default: No enhancement (original behavior)
+
+    return lab_buf, np.empty_like(original_image_bgr)
+
+def colorize_region_alternative(prepared_template: tuple[np.ndarray, ...], region_mask: np.ndarray, target_hex_color: str, output_image_bgr: np.ndarray, alternative_mode: int = 3) -> np.ndarray:
+    """
+    Applies a target color to a specific region of an image based on the chosen alternative mode.
+
+    Args:
+        prepared_template (tuple[np.ndarray, ...]): The template channels from prepare_template.
+        region_mask (np.ndarray): The single-channel binary mask for the region to colorize.
         target_hex_color (str): The hexadecimal color string (e.g., '#RRGGBB').
+        output_image_bgr (np.ndarray): The BGR image the colorized region is copied into.
         alternative_mode (int):
             1: HSV with Saturation/Value boost
             2: Weighted Blending (Grayscale + Solid Color)
             3: Lab with L-Channel Enhancement (default)
 
     Returns:
-        np.ndarray: The colorized region as a BGR image.
+        np.ndarray: output_image_bgr, with the colorized region written in place.
     """
-    if original_image_bgr is None:
-        raise ValueError("Original BGR image cannot be None for colorization.")
-    if region_mask_3ch is None:
+    if prepared_template is None:
+        raise ValueError("Prepared template cannot be None for colorization.")
+    if region_mask is None:
         raise ValueError("Region mask cannot be None for colorization.")
 
     target_bgr = hex_to_bgr(target_hex_color)
-    
-    # Initialize the colorized section with zeros
-    colorized_section = np.zeros_like(original_image_bgr, dtype=np.uint8)
 
     # --- Alternative 1: HSV with Saturation/Value Boost ---
     if alternative_mode == 1:
-        # Convert original image to HSV
-        original_hsv = cv2.cvtColor(original_image_bgr, cv2.COLOR_BGR2HSV)
-        H_orig, S_orig, V_orig = cv2.split(original_hsv)
-
-        # Convert target color to HSV
-        target_hsv_single_pixel = cv2.cvtColor(np.array([[target_bgr]], dtype=np.uint8), cv2.COLOR_BGR2HSV)
-        H_target, S_target, V_target = cv2.split(target_hsv_single_pixel)
+        hsv_buf, bgr_buf = prepared_template
 
-        # Use original V (luminosity), but new H and S
-        # Optional: Boost saturation and/or value
-        SAT_BOOST_FACTOR = 1.2 # Adjust this (e.g., 1.0 for no change, >1.0 for more saturation)
-        VALUE_OFFSET = 0    # Adjust this (e.g., 0 for no change, >0 for brighter)
+        # Target color in HSV (cached per hex)
+        H_target, S_target, V_target = hex_to_hsv(target_hex_color)
 
-        S_new = np.full_like(S_orig, S_target[0,0] * SAT_BOOST_FACTOR, dtype=np.float32)
-        S_new = np.clip(S_new, 0, 255).astype(np.uint8) # Ensure values are within range
+        # Use original V (luminosity), but new H and boosted S, written in place
+        S_new = np.clip(np.float32(S_target * SAT_BOOST_FACTOR), 0, 255) # Ensure values are within range
+        hsv_buf[..., 0].fill(H_target)
+        hsv_buf[..., 1].fill(int(S_new))
 
-        # Use original V, but apply offset for brightness
-        V_new = np.clip(V_orig + VALUE_OFFSET, 0, 255).astype(np.uint8)
-        
-        # Merge new H, S, V
-        combined_hsv = cv2.merge([np.full_like(H_orig, H_target[0,0], dtype=np.uint8), S_new, V_new])
-        colorized_result_bgr = cv2.cvtColor(combined_hsv, cv2.COLOR_HSV2BGR)
-        colorized_section = cv2.bitwise_and(colorized_result_bgr, region_mask_3ch)
+        cv2.cvtColor(hsv_buf, cv2.COLOR_HSV2BGR, dst=bgr_buf)
 
     # --- Alternative 2: Weighted Blending (Grayscale + Solid Color) ---
     elif alternative_mode == 2:
-        # Get grayscale version of original image (3 channels)
-        original_gray_3ch = cv2.cvtColor(cv2.cvtColor(original_image_bgr, cv2.COLOR_BGR2GRAY), cv2.COLOR_GRAY2BGR)
+        original_gray_3ch, gray_levels_scaled, bgr_buf = prepared_template
         
-        # Create a solid color image with the target BGR
-        solid_color_img = np.full_like(original_image_bgr, target_bgr, dtype=np.uint8)
-
-        # Blending factor: Adjust this for desired intensity
-        BLEND_ALPHA = 0.5 # 0.0 (more original) to 1.0 (more new color)
-        
-        # Blend the solid color with the grayscale image
-        blended_result = cv2.addWeighted(original_gray_3ch, 1.0 - BLEND_ALPHA, solid_color_img, BLEND_ALPHA, 0)
-        
-        colorized_section = cv2.bitwise_and(blended_result, region_mask_3ch)
+        # Blend the solid color with the grayscale image. Each output channel is an
+        # affine function of the gray level, so a 256-entry LUT does it in one lookup;
+        # only the solid color term changes per row.
+        blend_lut = gray_levels_scaled + np.array(target_bgr, dtype=np.float32) * BLEND_ALPHA
+        blend_lut = np.clip(np.rint(blend_lut), 0, 255).astype(np.uint8)
+        cv2.LUT(original_gray_3ch, blend_lut, dst=bgr_buf)
 
     # --- Alternative 3: Lab with L-Channel Enhancement ---
     else: # Default or if alternative_mode == 3
-        original_lab = cv2.cvtColor(original_image_bgr, cv2.COLOR_BGR2Lab)
-        L_orig, a_orig, b_orig = cv2.split(original_lab)
+        lab_buf, bgr_buf = prepared_template
+
+        # Target color in Lab (cached per hex)
+        _, a_target, b_target = hex_to_lab(target_hex_color)
+
+        # Overwrite the 'a' and 'b' planes in place, keeping the original L
+        lab_buf[..., 1].fill(a_target)
+        lab_buf[..., 2].fill(b_target)
+
+        cv2.cvtColor(lab_buf, cv2.COLOR_Lab2BGR, dst=bgr_buf)
+
+    # Masked copy straight into the output: no 3-channel mask or bitwise_and pass
+    return cv2.copyTo(bgr_buf, region_mask, output_image_bgr)
+
+
+# Read-only state shared by every row, set once per worker process by init_row_worker
+# so the template, masks and scratch buffers are not pickled with each task.
+_row_context = {}
+
+def init_row_worker(template_img: np.ndarray, prepared_template: tuple[np.ndarray, ...], body_mask: np.ndarray, pockets_mask: np.ndarray, webbings_mask: np.ndarray, output_dir: str, alternative_mode: int):
+    """
+    Process pool initializer: stashes the per-image state in module globals.
+    """
+    _row_context.update(
+        template_img=template_img,
+        prepared_template=prepared_template,
+        body_mask=body_mask,
+        pockets_mask=pockets_mask,
+        webbings_mask=webbings_mask,
+        output_dir=output_dir,
+        alternative_mode=alternative_mode,
+    )
+
+def process_row(row: tuple[str, str, str], io_pool: ThreadPoolExecutor) -> tuple[str, Future]:
+    """
+    Colorizes a single CSV row (filename, body_color, pockets_color) and queues it for saving.
 
-        target_color_lab_single_pixel = cv2.cvtColor(np.array([[target_bgr]], dtype=np.uint8), cv2.COLOR_BGR2Lab)
-        _, a_target, b_target = cv2.split(target_color_lab_single_pixel)
+    Returns:
+        tuple[str, Future]: The path of the image and the future of its cv2.imwrite call.
+    """
+    filename, body_color_hex, pockets_color_hex = row
+    ctx = _row_context
+    template_img = ctx['template_img']
+    alternative_mode = ctx['alternative_mode']
 
-        # Create new 'a' and 'b' channels of the full image size
-        a_new = np.full_like(a_orig, a_target[0,0], dtype=np.uint8)
-        b_new = np.full_like(b_orig, b_target[0,0], dtype=np.uint8)
+    # --- Combine All Layers into Final Image ---
+    # Start from a white background and copy each region in through its mask
+    final_image = np.full_like(template_img, (255, 255, 255), dtype=np.uint8)
+    colorize_region_alternative(ctx['prepared_template'], ctx['body_mask'], body_color_hex, final_image, alternative_mode)
+    colorize_region_alternative(ctx['prepared_template'], ctx['pockets_mask'], pockets_color_hex, final_image, alternative_mode)
+    # The original webbings remain unchanged
+    cv2.copyTo(template_img, ctx['webbings_mask'], final_image)
 
-        # --- Enhancement to L_orig (Optional, adjust carefully) ---
-        # You can try simple scaling and offset, or more complex operations
-        # L_orig_enhanced = cv2.equalizeHist(L_orig) # Example: Histogram equalization
-        # L_orig_enhanced = np.clip(L_orig * 1.1 + 10, 0, 255).astype(np.uint8) # Example: Brightness/Contrast
-        L_orig_enhanced = L_orig # Default: No enhancement (original behavior)
+    output_path = os.path.join(ctx['output_dir'], filename)
+    # final_image is allocated per row, so it can be handed off without a copy
+    return output_path, io_pool.submit(cv2.imwrite, output_path, final_image)
 
-        combined_lab = cv2.merge([L_orig_enhanced, a_new, b_new])
-        colorized_result_bgr = cv2.cvtColor(combined_lab, cv2.COLOR_Lab2BGR)
-        colorized_section = cv2.bitwise_and(colorized_result_bgr, region_mask_3ch)
 
-    return colorized_section
+def process_rows(rows: list[tuple[str, str, str]]) -> list[str]:
+    """
+    Colorizes a batch of CSV rows and saves them. cv2.imwrite runs on a small thread pool
+    (it releases the GIL while encoding), so each row is colorized while the previous one
+    is being saved. Every write is waited for before returning, so encoder errors reach
+    the parent process.
 
+    Returns:
+        list[str]: The paths of the images written.
 
-def colorize_image_with_masks_mvp(template_path: str, body_mask_path: str, pockets_mask_path: str, webbings_mask_path: str, output_dir: str, color_combinations_df: pd.DataFrame, current_alternative_mode: int = 3):
+    Raises:
+        IOError: If cv2.imwrite reports that an image could not be written.
+    """
+    with ThreadPoolExecutor(max_workers=IMWRITE_THREADS) as io_pool:
+        pending_writes = [process_row(row, io_pool) for row in rows]
+        for output_path, write_future in pending_writes:
+            if not write_future.result(): # re-raises cv2.error from the encoder
+                raise IOError(f"Error: Could not write output image {output_path}")
+    return [output_path for output_path, _ in pending_writes]
+
+
+def colorize_image_with_masks_mvp(template_path: str, body_mask_path: str, pockets_mask_path: str, webbings_mask_path: str, output_dir: str, color_combinations_df: pd.DataFrame, current_alternative_mode: int = 3, max_workers: int | None = None):
     """
     Colorizes an image using provided masks and color combinations,
     applying colors based on the chosen alternative mode.
@@ -119,6 +237,7 @@ def colorize_image_with_masks_mvp(template_path: str, body_mask_path: str, pocke
         output_dir (str): Directory to save the output images.
         color_combinations_df (pd.DataFrame): DataFrame containing color combinations.
         current_alternative_mode (int): The alternative mode to use for colorization (1, 2, or 3).
+        max_workers (int | None): Worker processes for the row loop (default: os.cpu_count()).
     """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -140,42 +259,38 @@ def colorize_image_with_masks_mvp(template_path: str, body_mask_path: str, pocke
     _, pockets_mask = cv2.threshold(pockets_mask, 128, 255, cv2.THRESH_BINARY)
     _, webbings_mask = cv2.threshold(webbings_mask, 128, 255, cv2.THRESH_BINARY)
 
-    body_mask_3ch = cv2.cvtColor(body_mask, cv2.COLOR_GRAY2BGR)
-    pockets_mask_3ch = cv2.cvtColor(pockets_mask, cv2.COLOR_GRAY2BGR)
-    webbings_mask_3ch = cv2.cvtColor(webbings_mask, cv2.COLOR_GRAY2BGR)
-
-    apparel_mask_raw = cv2.bitwise_or(body_mask, pockets_mask)
-    apparel_mask_raw = cv2.bitwise_or(apparel_mask_raw, webbings_mask)
-    _, apparel_mask_binary = cv2.threshold(apparel_mask_raw, 1, 255, cv2.THRESH_BINARY)
-    apparel_mask_3ch = cv2.cvtColor(apparel_mask_binary, cv2.COLOR_GRAY2BGR)
-    background_mask_3ch = cv2.bitwise_not(apparel_mask_3ch)
-
-    original_webbings = cv2.bitwise_and(template_img, webbings_mask_3ch)
-
-
-    for index, row in color_combinations_df.iterrows():
-        filename = row['filename']
-        body_color_hex = row['body_color']
-        pockets_color_hex = row['pockets_color']
-
-        # Call the new colorize_region_alternative function
-        body_section = colorize_region_alternative(template_img, body_mask_3ch, body_color_hex, current_alternative_mode)
-        pockets_section = colorize_region_alternative(template_img, pockets_mask_3ch, pockets_color_hex, current_alternative_mode)
-
-        # --- Combine All Layers into Final Image ---
-        output_img = np.full_like(template_img, (255, 255, 255), dtype=np.uint8)
-        output_img = cv2.bitwise_and(output_img, background_mask_3ch)
-        
-        apparel_composite = np.zeros_like(template_img, dtype=np.uint8)
-        apparel_composite = cv2.add(apparel_composite, body_section)
-        apparel_composite = cv2.add(apparel_composite, pockets_section)
-        apparel_composite = cv2.add(apparel_composite, original_webbings)
-
-        final_image = cv2.add(output_img, apparel_composite)
-
-        output_path = os.path.join(output_dir, filename)
-        cv2.imwrite(output_path, final_image)
-        print(f"Generated: {output_path} using Alternative {current_alternative_mode}")
+    # Rows share relatively few colors: convert each unique hex once up front
+    unique_colors = set(color_combinations_df['body_color']).union(color_combinations_df['pockets_color'])
+    for hex_color in unique_colors:
+        if current_alternative_mode == 1:
+            hex_to_hsv(hex_color)
+        elif current_alternative_mode == 2:
+            hex_to_bgr(hex_color)
+        else:
+            hex_to_lab(hex_color)
+
+    # The template is constant across rows: convert it once, not once per region per row
+    prepared_template = prepare_template(template_img, current_alternative_mode)
+
+    # Plain column arrays: iterrows() would build a pandas Series per row
+    rows = list(zip(
+        color_combinations_df['filename'].to_numpy(),
+        color_combinations_df['body_color'].to_numpy(),
+        color_combinations_df['pockets_color'].to_numpy(),
+    ))
+    row_batches = [rows[i:i + ROWS_PER_TASK] for i in range(0, len(rows), ROWS_PER_TASK)]
+
+    # Rows are independent: each worker gets its own copy of the template, masks
+    # and scratch buffers through the initializer, then processes batches of rows.
+    # A path is only reported once its image has been written.
+    with ProcessPoolExecutor(
+        max_workers=max_workers or os.cpu_count(),
+        initializer=init_row_worker,
+        initargs=(template_img, prepared_template, body_mask, pockets_mask, webbings_mask, output_dir, current_alternative_mode),
+    ) as executor:
+        for output_paths in executor.map(process_rows, row_batches):
+            for output_path in output_paths:
+                print(f"Generated: {output_path} using Alternative {current_alternative_mode}")
 
 # --- Main Execution Block ---
 if __name__ == "__main__":
@@ -3,10 +3,18 @@ from PIL import Image
 import seaborn as sns
 from classes.visualize import create_pairplot, create_histogram, create_violinplot
 
-# Load data
-df = sns.load_dataset('iris')
+# Load data (cacheado: no se recarga en cada rerun por interaccion con widgets)
+# show_spinner=False: corre antes de set_page_config, no debe emitir elementos
+@st.cache_data(show_spinner=False)
+def load_iris():
+    df = sns.load_dataset('iris')
+    # species como categoria: el filtro compara codigos int8 en vez de strings
+    df['species'] = df['species'].astype('category')
+    return df
+
+df = load_iris()
 attributes = df.columns[:-1].tolist()
-species = df['species'].unique().tolist()
+species = df['species'].cat.categories.tolist()
 
 # page config
 st.set_page_config(
@@ -35,7 +43,8 @@ with st.sidebar:
 # handle filter selections
 if not selected_species:
     selected_species = species
-filtered_df = df[df['species'].isin(selected_species)]
+selected_codes = df['species'].cat.categories.get_indexer(selected_species)
+filtered_df = df[df['species'].cat.codes.isin(selected_codes)]
 
 # descriptivas basicas
 st.header("Estadigrafos")
@@ -1,12 +1,16 @@
 import plotly.express as px
+import streamlit as st
 
+@st.cache_data
 def create_pairplot(df, attributes, species):
+    # scatter_matrix ya genera una traza splom, que plotly dibuja con WebGL
     fig = px.scatter_matrix(df, dimensions=attributes, color="species", 
                             opacity=0.6)
     fig.update_traces(diagonal_visible=False)
     return fig
 
 
+@st.cache_data
 def create_histogram(df, attribute):
     fig = px.histogram(df, x=attribute, color="species", marginal="box", barmode='overlay', opacity=0.7)
     fig.update_traces(marker=dict(line=dict(width=1, color='DarkSlateGrey')))
@@ -14,6 +18,7 @@ def create_histogram(df, attribute):
     fig.update_layout(bargap=0.1)
     return fig
 
+@st.cache_data
 def create_violinplot(df, attribute, points="all"):
     fig = px.violin(df, x="species", y=attribute, color="species", box=True, points=points, hover_data=df.columns)
     fig.update_layout(title=f'Violinplot of {attribute}', hovermode="x unified")
@@ -30,11 +35,11 @@ def create_correlation_heatmap(df, attributes):
     return fig
 
 def create_scatter_plot(df, x_attr, y_attr):
-    fig = px.scatter(df, x=x_attr, y=y_attr, color="species", hover_data=df.columns, title=f'Scatter Plot of {x_attr} vs {y_attr}')
+    fig = px.scatter(df, x=x_attr, y=y_attr, color="species", hover_data=df.columns, render_mode='webgl', title=f'Scatter Plot of {x_attr} vs {y_attr}')
     return fig
 
 def create_line_plot(df, x_attr, y_attr):
-    fig = px.line(df, x=x_attr, y=y_attr, color="species", markers=True, title=f'Line Plot of {x_attr} vs {y_attr}')
+    fig = px.line(df, x=x_attr, y=y_attr, color="species", markers=True, render_mode='webgl', title=f'Line Plot of {x_attr} vs {y_attr}')
     return fig
 
 def create_pie_chart(df, attribute):
@@ -50,7 +55,7 @@ def create_area_chart(df, x_attr, y_attr):
     return fig  
 
 def create_facet_plot(df, x_attr, y_attr):
-    fig = px.scatter(df, x=x_attr, y=y_attr, color="species", facet_col="species", title=f'Facet Plot of {y_attr} by {x_attr}')
+    fig = px.scatter(df, x=x_attr, y=y_attr, color="species", facet_col="species", render_mode='webgl', title=f'Facet Plot of {y_attr} by {x_attr}')
     return fig  
 
 def create_density_heatmap(df, x_attr, y_attr):
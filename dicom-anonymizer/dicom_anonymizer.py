@@ -25,34 +25,71 @@ Uso:
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
-from typing import List
+from typing import Iterator, Optional, Tuple
 import pydicom
 import concurrent.futures
 import multiprocessing
 
 VALOR_ANONIMO = 'Anonimo'
+DICOM_PREAMBLE_SIZE = 128
+DICOM_PREFIX = b'DICM'
+# Trabajo dominado por I/O (dcmread/save_as): hilos en vez de procesos
+DEFAULT_WORKERS = min(32, multiprocessing.cpu_count() * 4)
+DEFER_SIZE = '1 KB'  # Elementos mayores a esto (pixeles) no se cargan en memoria
 
 
 
-def find_dicom_files(folder_path: Path) -> List[Path]:
+def find_dicom_files(folder_path: Path, exclude: Optional[Path] = None) -> Iterator[Path]:
     """
-    Encuentra recursivamente todos los archivos en la carpeta.
+    Recorre recursivamente la carpeta y produce cada archivo a medida que lo
+    encuentra, sin cargar el arbol completo en memoria.
+
+    Usa os.scandir: DirEntry.is_file()/is_dir() reutilizan la informacion del
+    listado del directorio, sin un stat adicional por archivo.
 
     Args:
         folder_path: Ruta a la carpeta a buscar.
+        exclude: Carpeta a omitir (p. ej. la de salida si esta dentro de folder_path).
+
+    Yields:
+        Rutas de archivos.
+    """
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            entry_path = Path(entry.path)
+            if entry.is_dir(follow_symlinks=False):
+                if exclude is None or entry_path.resolve() != exclude:
+                    yield from find_dicom_files(entry_path, exclude)
+            elif entry.is_file():
+                yield entry_path
+
+
+def is_dicom_file(file_path: Path) -> bool:
+    """
+    Verifica rapidamente si un archivo es DICOM leyendo solo el prefijo 'DICM'
+    que sigue al preambulo de 128 bytes, sin parsear el archivo completo.
+
+    Args:
+        file_path: Ruta al archivo.
 
     Returns:
-        Lista de rutas de archivos.
+        bool: True si el archivo tiene el prefijo DICOM, False en caso contrario.
     """
-    all_files = list(folder_path.rglob('*'))
-    return [fp for fp in all_files if fp.is_file()]
+    try:
+        with open(file_path, 'rb') as f:
+            f.seek(DICOM_PREAMBLE_SIZE)
+            return f.read(len(DICOM_PREFIX)) == DICOM_PREFIX
+    except OSError:
+        return False
 
 
 def read_dicom_file(file_path: Path) -> pydicom.Dataset:
     """
-    Lee archivos DICOM incluyendo pixeles.
+    Lee archivos DICOM. Los elementos grandes (p.ej. PixelData) se difieren:
+    quedan en disco y se leen de nuevo solo al guardar, ya que no se modifican.
 
     Args:
         file_path: Ruta al archivo.
@@ -60,7 +97,7 @@ def read_dicom_file(file_path: Path) -> pydicom.Dataset:
     Returns:
         pydicom.Dataset: Lista de datos DICOM para ser iterada.
     """
-    return pydicom.dcmread(file_path)
+    return pydicom.dcmread(file_path, defer_size=DEFER_SIZE)
 
 
 def anonymize_patient_info(ds: pydicom.Dataset) -> None:
@@ -139,6 +176,16 @@ def process_dicom_file(file_path: Path, output_path: Path, verbose: bool = True)
         print(f"Error procesando {file_path}: {e}")
 
 
+def process_dicom_task(task: Tuple[Path, Path, bool]) -> None:
+    """
+    Desempaqueta una tarea (entrada, salida, verbose) para usarla con executor.map.
+
+    Args:
+        task: Tupla con los argumentos de process_dicom_file.
+    """
+    process_dicom_file(*task)
+
+
 def main() -> None:
     """
     Funcion principal para leer folder, validar archivos DICOM, reemplazar valores y guardar.
@@ -165,8 +212,8 @@ def main() -> None:
     parser.add_argument(
         '--workers',
         type=int,
-        default=multiprocessing.cpu_count(),
-        help=f'Numero de workers en paralelo (predeterminado: {multiprocessing.cpu_count()}).' # agilizar procesamiento en paralelo.
+        default=DEFAULT_WORKERS,
+        help=f'Numero de hilos en paralelo (predeterminado: {DEFAULT_WORKERS}).' # agilizar procesamiento en paralelo.
     )
 
     args = parser.parse_args()
@@ -181,31 +228,28 @@ def main() -> None:
     # Crear carpeta de almacenamiento si no existe
     store_path.mkdir(parents=True, exist_ok=True)
 
-    dicom_files = find_dicom_files(folder_path)
+    # Las tareas se generan mientras se recorre el arbol: los hilos empiezan con
+    # los primeros archivos sin esperar el listado completo. Se descartan los no
+    # DICOM (README, .DS_Store, etc.) y la carpeta de salida, que se va llenando.
+    tasks = (
+        (file_path, store_path / file_path.relative_to(folder_path), args.verbose)
+        for file_path in find_dicom_files(folder_path, exclude=store_path.resolve())
+        if is_dicom_file(file_path)
+    )
 
-    if not dicom_files:
+    # Procesar archivos en paralelo con hilos: la carga es de I/O y pydicom libera
+    # el GIL al leer/escribir, sin el costo de fork, IPC ni pickle de Datasets.
+    # process_dicom_file ya captura y reporta los errores de cada archivo.
+    processed = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for _ in executor.map(process_dicom_task, tasks):
+            processed += 1
+
+    if not processed:
         print(f"⚠️ No se encontraron archivos en '{folder_path}'.")
         return
 
-    print(f"✅ Encontrados {len(dicom_files)} archivos para procesar.")
-
-    # Preparar tareas
-    tasks = []
-    for file_path in dicom_files:
-        relative_path = file_path.relative_to(folder_path)
-        output_path = store_path / relative_path
-        tasks.append((file_path, output_path, args.verbose))
-
-    # Procesar archivos en paralelo
-    with concurrent.futures.ProcessPoolExecutor(max_workers=args.workers) as executor:
-        futures = {executor.submit(process_dicom_file, *task): task for task in tasks}
-        for future in concurrent.futures.as_completed(futures):
-            try:
-                future.result()
-            except Exception as exc:
-                task = futures[future]
-                print(f"⚠️ Error procesando {task[0]}: {exc}")
-
+    print(f"✅ Procesados {processed} archivos.")
     print("🎉 Anonimizacion completa.")
 
 
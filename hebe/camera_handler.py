@@ -2,6 +2,9 @@
 import cv2
 import sys # For error output
 
+# On Linux open webcams through V4L2 directly; elsewhere let OpenCV pick the backend
+CAPTURE_BACKEND = cv2.CAP_V4L2 if sys.platform.startswith('linux') else cv2.CAP_ANY
+
 class CameraHandler:
     def __init__(self, camera_index: int):
         """
@@ -24,14 +27,25 @@ class CameraHandler:
         Raises an IOError if the camera cannot be opened.
         """
         print(f"Digital Makeup: CameraHandler: Attempting to open camera {self.camera_index}...")
-        self.cap = cv2.VideoCapture(self.camera_index)
+        self.cap = cv2.VideoCapture(self.camera_index, CAPTURE_BACKEND)
+        if not self.cap.isOpened() and CAPTURE_BACKEND != cv2.CAP_ANY:
+            # Fall back to OpenCV's default backend selection (e.g. GStreamer-only builds)
+            self.cap.release()
+            self.cap = cv2.VideoCapture(self.camera_index)
 
         if not self.cap.isOpened():
             # Release any potentially partially opened resources
             self.cap.release()
             raise IOError(f"Digital Makeup: CameraHandler Error: Could not open camera at index {self.camera_index}. "
                           "Please ensure the camera is connected and not in use by another application.")
-        
+
+        # Request MJPG from the device: USB cams compress on-board, which needs far less
+        # bandwidth than raw YUV and allows higher frame rates. Ignored if unsupported.
+        self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        # Keep a single buffered frame so read_frame always returns the latest one
+        # instead of lagging several frames behind the sensor.
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
         # Get actual camera properties
         self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
@@ -67,4 +81,27 @@ class CameraHandler:
             if not ret:
                 print("Digital Makeup: CameraHandler Warning: Failed to read frame.", file=sys.stderr)
             return ret, frame
-        return False, None
\ No newline at end of file
+        return False, None
+
+    def read_into(self, buffer: cv2.Mat) -> tuple[bool, cv2.Mat | None]:
+        """
+        Reads a single frame from the camera into a preallocated buffer, avoiding a new
+        frame allocation on every call.
+
+        Args:
+            buffer (np.ndarray): A (height, width, 3) uint8 array reused across frames.
+                                 If its shape does not match the decoded frame, OpenCV
+                                 allocates a new array instead.
+
+        Returns:
+            tuple[bool, np.ndarray | None]: A tuple where the first element is True if a frame
+                                          was successfully read, and the second element is the frame
+                                          (normally `buffer` itself) or None if reading failed.
+        """
+        if self.cap and self.cap.isOpened():
+            if self.cap.grab():
+                ret, frame = self.cap.retrieve(image=buffer)
+                if ret:
+                    return ret, frame
+            print("Digital Makeup: CameraHandler Warning: Failed to read frame.", file=sys.stderr)
+        return False, None
@@ -8,6 +8,7 @@ class DigitalFilters:
         Initializes the DigitalFilters module. This module is responsible for applying
         various digital image processing effects, often guided by masks.
         """
+        self._gaussian_kernels = {} # kernel size -> 1D Gaussian kernel, reused across frames
         print("Digital Makeup: DigitalFilters: Initialized.")
 
     def __enter__(self):
@@ -20,6 +21,16 @@ class DigitalFilters:
         print("Digital Makeup: DigitalFilters: Finished applying effects.")
         pass
 
+    def _gaussian_kernel(self, size: int) -> np.ndarray:
+        """
+        Returns the 1D Gaussian kernel for an odd size (sigma derived from the size, as in
+        cv2.GaussianBlur), building it only the first time that size is requested.
+        """
+        kernel = self._gaussian_kernels.get(size)
+        if kernel is None:
+            kernel = self._gaussian_kernels[size] = cv2.getGaussianKernel(size, 0)
+        return kernel
+
     def apply_targeted_blur(self, 
                             image: cv2.Mat, 
                             target_mask: cv2.Mat, 
@@ -41,7 +52,13 @@ class DigitalFilters:
         Returns:
             cv2.Mat: The image with the targeted blur applied.
         """
-        if target_mask is None or np.all(target_mask == 0):
+        # alpha 0 means no visible blur: skip the work entirely
+        if target_mask is None or alpha <= 0.0:
+            return image
+
+        # Only the mask's bounding box needs blurring; an empty mask has a 0x0 box
+        x, y, w, h = cv2.boundingRect(target_mask)
+        if w == 0 or h == 0:
             return image
 
         # Ensure kernel size is odd and at least 3x3
@@ -51,26 +68,26 @@ class DigitalFilters:
         if kernel_size[0] < 3: kernel_size = (3, kernel_size[1])
         if kernel_size[1] < 3: kernel_size = (kernel_size[0], 3)
 
-        # 1. Create a blurred version of the entire image
-        blurred_full_image = cv2.GaussianBlur(image, kernel_size, 0)
+        # 1. Blur the bounding box, padded by the kernel radius so pixels near its edges
+        #    see the same neighbourhood as a full-frame blur. The Gaussian is separable:
+        #    two 1D passes (k + k taps per pixel) instead of a k x k window.
+        pad_x, pad_y = kernel_size[0] // 2, kernel_size[1] // 2
+        x0, y0 = max(x - pad_x, 0), max(y - pad_y, 0)
+        x1, y1 = min(x + w + pad_x, image.shape[1]), min(y + h + pad_y, image.shape[0])
+        kernel_x = self._gaussian_kernel(kernel_size[0])
+        kernel_y = self._gaussian_kernel(kernel_size[1])
+        blurred_crop = cv2.sepFilter2D(image[y0:y1, x0:x1], -1, kernel_x, kernel_y)
 
-        # Ensure the mask is 3-channel if the image is BGR
-        mask_3_channel = cv2.merge([target_mask, target_mask, target_mask])
-        
-        # 2. Extract the blurred region using the mask
-        blurred_region = cv2.bitwise_and(blurred_full_image, mask_3_channel)
-        
-        # 3. Extract the non-blurred region from the original image
-        inverse_mask_3_channel = cv2.bitwise_not(mask_3_channel) 
-        original_non_blurred_region = cv2.bitwise_and(image, inverse_mask_3_channel)
+        blurred_roi = blurred_crop[y - y0:y - y0 + h, x - x0:x - x0 + w]
+        image_roi = image[y:y + h, x:x + w]
 
-        # 4. Combine the non-blurred original parts and the blurred parts
-        combined_image = cv2.bitwise_or(original_non_blurred_region, blurred_region)
-
-        # 5. Apply blending if alpha < 1.0
+        # 2. Blend the blurred box with the original if alpha < 1.0, in place: blurred_roi is
+        #    a view into our own blurred_crop, so no new ROI-sized array is needed
         if alpha < 1.0:
-            output_image = cv2.addWeighted(image, 1.0 - alpha, combined_image, alpha, 0)
-            return output_image
-        else:
-            # If alpha is 1.0, return the fully combined (blurred where masked) image directly
-            return combined_image
\ No newline at end of file
+            cv2.addWeighted(image_roi, 1.0 - alpha, blurred_roi, alpha, 0, dst=blurred_roi)
+
+        # 3. Composite through the single-channel mask (broadcast over B, G, R) in one
+        #    pass; outside the bounding box the mask is 0, so the original is kept there
+        output_image = image.copy()
+        np.copyto(output_image[y:y + h, x:x + w], blurred_roi, where=target_mask[y:y + h, x:x + w, None] > 0)
+        return output_image
@@ -9,8 +9,15 @@ def draw_points(image: cv2.Mat, points: list[tuple[int, int]], color: tuple[int,
     Args: image, points, color, radius, thickness
     Returns: The image with points drawn.
     """
+    if thickness < 0 and radius > 0:
+        # A zero-length segment drawn with thickness 2*radius rasterizes to the same filled
+        # disc as cv2.circle(..., -1), so all points go to OpenCV in one polylines call
+        if len(points) > 0:
+            pts = np.asarray(points, dtype=np.int32).reshape(-1, 1, 2)
+            cv2.polylines(image, np.concatenate((pts, pts), axis=1), False, color, 2 * radius)
+        return image
     for x, y in points:
-        cv2.circle(image, (x, y), radius, color, thickness)
+        cv2.circle(image, (int(x), int(y)), radius, color, thickness)
     return image
 
 def draw_lines(image: cv2.Mat, lines: list[tuple[tuple[int, int], tuple[int, int]]], color: tuple[int, int, int] = (255, 255, 255), thickness: int = 1) -> cv2.Mat:
@@ -19,8 +26,9 @@ def draw_lines(image: cv2.Mat, lines: list[tuple[tuple[int, int], tuple[int, int
     Args: image, lines, color, thickness
     Returns: The image with lines drawn.
     """
-    for (x1, y1), (x2, y2) in lines:
-        cv2.line(image, (x1, y1), (x2, y2), color, thickness)
+    # One polylines call with an (N, 2, 2) array of open 2-point segments, not N cv2.line calls
+    if len(lines) > 0:
+        cv2.polylines(image, np.asarray(lines, dtype=np.int32).reshape(-1, 2, 2), False, color, thickness)
     return image
 
 def draw_text(image: cv2.Mat, text: str, position: tuple[int, int], font_scale: float = 0.7, color: tuple[int, int, int] = (255, 255, 255), thickness: int = 2) -> cv2.Mat:
@@ -84,10 +92,11 @@ def draw_face_mesh_overlay(image: cv2.Mat,
     Returns:
         cv2.Mat: The image with face mesh drawn.
     """
-    if results and results.multi_face_landmarks:
-        for face_idx, face_points in enumerate(all_faces_points):
-            draw_points(image, face_points, color=point_color, radius=point_radius, thickness=-1) 
-            draw_lines(image, all_faces_lines[face_idx], color=line_color, thickness=line_thickness)
+    if results and results.multi_face_landmarks and len(all_faces_points) > 0:
+        # All faces share the same colors: one points call and one lines call for every face
+        # together, instead of two calls per face
+        draw_points(image, np.concatenate(all_faces_points), color=point_color, radius=point_radius, thickness=-1) 
+        draw_lines(image, np.concatenate(all_faces_lines), color=line_color, thickness=line_thickness)
     return image
 
 def draw_face_mask_overlay(image: cv2.Mat, 
@@ -96,6 +105,7 @@ def draw_face_mask_overlay(image: cv2.Mat,
                            alpha: float = 0.3) -> cv2.Mat:
     """
     Draws a semi-transparent face mask overlay on the image.
+    Pixels outside the mask are left unchanged.
 
     Args:
         image (cv2.Mat): The base image.
@@ -106,10 +116,15 @@ def draw_face_mask_overlay(image: cv2.Mat,
     Returns:
         cv2.Mat: The image with the mask overlay.
     """
-    # Create a colored overlay layer based on the binary mask
-    colored_mask_overlay = np.zeros_like(image)
-    colored_mask_overlay[face_mask_binary == 255] = mask_color 
-    
-    # Alpha blend the colored mask overlay with the base image
-    # This handles an all-black colored_mask_overlay gracefully if face_mask_binary is empty
-    return alpha_composite_images(image, colored_mask_overlay, alpha)
\ No newline at end of file
+    output_image = image.copy()
+
+    # Only the mask's bounding box is touched; an empty mask has a 0x0 box
+    x, y, w, h = cv2.boundingRect(face_mask_binary)
+    if w == 0 or h == 0:
+        return output_image
+
+    # Blend the mask color into the box, then copy the blend back through the mask
+    image_roi = image[y:y + h, x:x + w]
+    blended_roi = alpha_composite_images(image_roi, np.full_like(image_roi, mask_color), alpha)
+    np.copyto(output_image[y:y + h, x:x + w], blended_roi, where=face_mask_binary[y:y + h, x:x + w, None] == 255)
+    return output_image
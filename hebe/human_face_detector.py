@@ -7,18 +7,26 @@ from typing import Any # Corrected import for MediaPipe results type hinting
 
 class HumanFaceDetector: # Renamed class
     def __init__(self, static_image_mode: bool = False, max_num_faces: int = 1,
-                 min_detection_confidence: float = 0.5, min_tracking_confidence: float = 0.5):
+                 min_detection_confidence: float = 0.5, min_tracking_confidence: float = 0.5,
+                 detection_scale: float = 1.0):
         """
         Initializes the HumanFaceDetector for the Digital Makeup application using MediaPipe Face Mesh.
         This module is responsible for detecting human faces and extracting their raw landmark data.
+        detection_scale < 1.0 runs Face Mesh on a downscaled copy of each frame (e.g. 0.5 for ~4x
+        fewer pixels); landmarks are normalized, so they still map onto the full-size frame.
         """
         self.static_image_mode = static_image_mode
         self.max_num_faces = max_num_faces
         self.min_detection_confidence = min_detection_confidence
         self.min_tracking_confidence = min_tracking_confidence
+        self.detection_scale = detection_scale
 
         self.mp_face_mesh = mp.solutions.face_mesh
         self.face_mesh_model = None 
+        self._small_buffer = None # downscaled BGR frame when detection_scale < 1.0, reused across frames
+        self._rgb_buffer = None # RGB copy of the frame handed to MediaPipe, reused across frames
+        self._mesh_connections = None # (N, 2) landmark index pairs: tessellation then contours
+        self._face_buffers = [] # per face slot: (points, lines) int32 arrays reused across frames
 
         print("Digital Makeup: HumanFaceDetector: Initializing MediaPipe Face Mesh.")
 
@@ -33,6 +41,10 @@ class HumanFaceDetector: # Renamed class
             min_detection_confidence=self.min_detection_confidence,
             min_tracking_confidence=self.min_tracking_confidence
         )
+        # The connection sets never change: convert them to one index array up front
+        # instead of iterating ~2700 Python tuples every frame
+        self._mesh_connections = np.array(list(self.mp_face_mesh.FACEMESH_TESSELATION) +
+                                          list(self.mp_face_mesh.FACEMESH_CONTOURS), dtype=np.intp)
         print("Digital Makeup: HumanFaceDetector: Face Mesh model loaded successfully.")
         return self
 
@@ -45,6 +57,20 @@ class HumanFaceDetector: # Renamed class
             self.face_mesh_model.close()
         self.face_mesh_model = None
 
+    def _get_face_buffers(self, face_idx: int, num_landmarks: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the reusable (points, lines) int32 buffers for a face slot, allocating them
+        the first time the slot is used or when the landmark count changes.
+        """
+        if face_idx == len(self._face_buffers):
+            self._face_buffers.append(None)
+        buffers = self._face_buffers[face_idx]
+        if buffers is None or len(buffers[0]) != num_landmarks:
+            buffers = (np.empty((num_landmarks, 2), dtype=np.int32),
+                       np.empty((len(self._mesh_connections), 2, 2), dtype=np.int32))
+            self._face_buffers[face_idx] = buffers
+        return buffers
+
     def process_frame(self, image_bgr: cv2.Mat) -> tuple[Any | None, cv2.Mat, list, list]: # Corrected type hint
         """
         Processes a single BGR image frame to detect human face landmarks and extract raw drawing data.
@@ -56,48 +82,64 @@ class HumanFaceDetector: # Renamed class
             tuple[Any | None, cv2.Mat, list[list[tuple[int, int]]], list[list[tuple[tuple[int, int], tuple[int, int]]]]]:
                 A tuple containing:
                 1. The MediaPipe results object (type Any | None if no faces detected).
-                2. The original image.
-                3. A list of lists, where each inner list contains (x, y) pixel coordinates
-                   for all landmarks of a single detected face.
-                4. A list of lists, where each inner list contains ((x1, y1), (x2, y2))
-                   pixel line segments for the tessellation and contours of a single face.
+                2. The original image (a C-contiguous copy if the input was a non-contiguous view).
+                3. A list with one (N, 2) int32 array per detected face, holding the (x, y)
+                   pixel coordinates of all its landmarks.
+                4. A list with one (M, 2, 2) int32 array per detected face, holding the
+                   ((x1, y1), (x2, y2)) pixel line segments of its tessellation and contours.
+                Both point and line arrays are reused buffers, overwritten by the next call.
         """
         if self.face_mesh_model is None:
             raise RuntimeError("Digital Makeup: HumanFaceDetector: Face Mesh model not initialized. Call __enter__ first.")
 
-        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh_model.process(image_rgb)
-        
+        # Pipeline ingress: every later stage (cvtColor, Canny, blur, pyvirtualcam) gets this
+        # frame, and OpenCV copies non-contiguous views (e.g. flipped slices) on each call.
+        # Make it C-contiguous once here; camera frames already are, so this is just a check.
+        if not image_bgr.flags['C_CONTIGUOUS']:
+            image_bgr = np.ascontiguousarray(image_bgr)
+
         h, w, _ = image_bgr.shape
+
+        # Downscale before the color conversion so both it and inference see fewer pixels
+        detection_bgr = image_bgr
+        if self.detection_scale < 1.0:
+            small_w, small_h = max(1, round(w * self.detection_scale)), max(1, round(h * self.detection_scale))
+            if self._small_buffer is None or self._small_buffer.shape[:2] != (small_h, small_w):
+                self._small_buffer = np.empty((small_h, small_w, 3), dtype=np.uint8)
+            detection_bgr = cv2.resize(image_bgr, (small_w, small_h), dst=self._small_buffer, interpolation=cv2.INTER_AREA)
+
+        # Convert into the same RGB buffer every frame instead of allocating a new image
+        if self._rgb_buffer is None or self._rgb_buffer.shape != detection_bgr.shape:
+            self._rgb_buffer = np.empty_like(detection_bgr)
+        image_rgb = cv2.cvtColor(detection_bgr, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+        # MediaPipe copies writeable arrays into its image packet but references read-only
+        # ones: lock the (C-contiguous) buffer just for the call so it is passed by reference
+        image_rgb.flags.writeable = False
+        try:
+            results = self.face_mesh_model.process(image_rgb)
+        finally:
+            image_rgb.flags.writeable = True # cvtColor writes into it again next frame
         
         all_faces_points = [] 
         all_faces_lines = []  
 
         if results and results.multi_face_landmarks: # Added 'results and' check for robustness
-            for face_landmarks in results.multi_face_landmarks:
-                current_face_points = []
-                for landmark in face_landmarks.landmark:
-                    cx, cy = int(landmark.x * w), int(landmark.y * h)
-                    current_face_points.append((cx, cy))
+            image_scale = np.array((w, h), dtype=np.float64)
+            for face_idx, face_landmarks in enumerate(results.multi_face_landmarks):
+                landmarks = face_landmarks.landmark
+                current_face_points, current_face_lines = self._get_face_buffers(face_idx, len(landmarks))
+
+                # Landmarks -> (N, 2) pixel array: one C-level fill, an in-place scale and a
+                # truncating cast into the reused int32 buffer (same values as int(landmark.x * w))
+                normalized_points = np.fromiter((v for landmark in landmarks for v in (landmark.x, landmark.y)),
+                                                dtype=np.float64, count=2 * len(landmarks)).reshape(-1, 2)
+                np.multiply(normalized_points, image_scale, out=normalized_points)
+                np.copyto(current_face_points, normalized_points, casting='unsafe')
                 all_faces_points.append(current_face_points)
 
-                current_face_lines = []
-                for connection in self.mp_face_mesh.FACEMESH_TESSELATION:
-                    start_idx = connection[0]
-                    end_idx = connection[1]
-                    if start_idx < len(current_face_points) and end_idx < len(current_face_points):
-                        pt1 = current_face_points[start_idx]
-                        pt2 = current_face_points[end_idx]
-                        current_face_lines.append((pt1, pt2))
-                
-                for connection in self.mp_face_mesh.FACEMESH_CONTOURS:
-                    start_idx = connection[0]
-                    end_idx = connection[1]
-                    if start_idx < len(current_face_points) and end_idx < len(current_face_points):
-                        pt1 = current_face_points[start_idx]
-                        pt2 = current_face_points[end_idx]
-                        current_face_lines.append((pt1, pt2))
-                
+                # Gather both endpoints of every segment at once: (N, 2) indices -> (N, 2, 2) points.
+                # All connection indices address the 468 base landmarks, always present.
+                np.take(current_face_points, self._mesh_connections, axis=0, out=current_face_lines)
                 all_faces_lines.append(current_face_lines)
 
         return results, image_bgr, all_faces_points, all_faces_lines
\ No newline at end of file
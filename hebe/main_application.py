@@ -1,6 +1,10 @@
 # main_application.py (UPDATED for Troubleshooting: Stronger Blur)
 import argparse
+import os
+import queue
 import sys
+import threading
+import cv2
 import numpy as np 
 
 from camera_handler import CameraHandler 
@@ -16,14 +20,32 @@ from drawing_utility import (
     draw_text 
 )
 
+# Frames captured ahead of processing; small so the output never lags far behind the camera
+FRAME_QUEUE_SIZE = 2
+
+# Face Mesh defaults, shared by MainApplication and the command line
+DEFAULT_INFERENCE_SCALE = 0.5 # frame scale Face Mesh runs at
+DEFAULT_INFERENCE_INTERVAL = 2 # run Face Mesh on every Nth frame
+
+# Per-frame effect settings, built once instead of on every loop iteration
+MASK_DILATION_KERNEL_SIZE = 7
+NASOLABIAL_BLUR_KERNEL_SIZE = (75, 75) # VERY STRONG, for troubleshooting
+NASOLABIAL_BLUR_ALPHA = 1.0
+
 class MainApplication:
-    def __init__(self, camera_index: int, virtual_camera_path: str, max_num_faces: int = 1):
+    def __init__(self, camera_index: int, virtual_camera_path: str, max_num_faces: int = 1,
+                 inference_scale: float = DEFAULT_INFERENCE_SCALE, inference_interval: int = DEFAULT_INFERENCE_INTERVAL):
         """
         Initializes the main Digital Makeup application with configuration parameters.
+        inference_scale is the frame scale Face Mesh runs at (see HumanFaceDetector detection_scale).
+        inference_interval runs Face Mesh on every Nth frame only; frames in between reuse the
+        last landmarks, which barely move from one frame to the next.
         """
         self.camera_index = camera_index
         self.virtual_camera_path = virtual_camera_path
         self.max_num_faces = max_num_faces 
+        self.inference_scale = inference_scale
+        self.inference_interval = max(1, inference_interval)
 
         self.camera_handler = None 
         self.camera_handler = None 
@@ -33,8 +55,106 @@ class MainApplication:
         self.mask_detector = None 
         self.digital_filters = None 
 
+        self._frame_counter = 0 # frames seen by the detection stage
+        self._last_detection = None # (results, points, lines) of the last Face Mesh run
+
         print(f"Digital Makeup: MainApplication: Initializing with physical camera index '{self.camera_index}', "
-              f"virtual camera path '{self.virtual_camera_path}', and max faces '{self.max_num_faces}'.")
+              f"virtual camera path '{self.virtual_camera_path}', max faces '{self.max_num_faces}', "
+              f"and inference scale '{self.inference_scale}'.")
+
+        # Keep OpenCV's SIMD/IPP code paths enabled and cap its thread pool at half the cores,
+        # leaving the rest for MediaPipe's inference threads.
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
+        print(f"Digital Makeup: MainApplication: OpenCV optimized={cv2.useOptimized()}, threads={cv2.getNumThreads()}.")
+
+    @staticmethod
+    def _put_until_stopped(target_queue: queue.Queue, item, stop_event: threading.Event) -> bool:
+        """
+        Puts an item on a bounded queue, blocking while it is full (back-pressure) but waking
+        up regularly to honour stop_event.
+
+        Returns:
+            bool: True if the item was queued, False if stop_event was set first.
+        """
+        while not stop_event.is_set():
+            try:
+                target_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _capture_worker(self, frame_queue: queue.Queue, stop_event: threading.Event):
+        """
+        Capture stage: reads camera frames into a small ring of reused buffers and hands them
+        to the detection stage through a bounded queue, so grabbing/decoding the next frame
+        overlaps with processing the current one. Always puts None when it ends (camera stopped
+        delivering or failed), so the downstream stages never wait on a dead producer.
+
+        Args:
+            frame_queue (queue.Queue): Bounded queue (FRAME_QUEUE_SIZE) the frames are put on.
+            stop_event (threading.Event): Set by the processing loop to stop this worker.
+        """
+        # A frame can be waiting in either queue (FRAME_QUEUE_SIZE each), held by the detection
+        # stage, held by the effects loop, or being captured: that many buffers guarantees none
+        # is overwritten while in use
+        frame_buffers = [np.empty((self.camera_handler.height, self.camera_handler.width, 3), dtype=np.uint8)
+                         for _ in range(2 * FRAME_QUEUE_SIZE + 3)]
+        buffer_index = 0
+        try:
+            while not stop_event.is_set():
+                ret, frame = self.camera_handler.read_into(frame_buffers[buffer_index])
+                buffer_index = (buffer_index + 1) % len(frame_buffers)
+                if not ret or not self._put_until_stopped(frame_queue, frame, stop_event):
+                    return
+        except Exception as e:
+            print(f"Digital Makeup: MainApplication: Frame capture failed: {e}", file=sys.stderr)
+        finally:
+            # End-of-stream marker; a no-op once stop_event is set
+            self._put_until_stopped(frame_queue, None, stop_event)
+
+    def _detection_worker(self, frame_queue: queue.Queue, detection_queue: queue.Queue, stop_event: threading.Event):
+        """
+        Detection stage: runs MediaPipe Face Mesh on every inference_interval-th captured frame
+        while the effects loop works on the previous one, and hands (results, frame, points, lines)
+        on through a bounded queue; skipped frames reuse the last landmarks. Always puts None
+        when it ends (capture ended or detection failed), so the effects loop never waits on a
+        dead producer.
+
+        Args:
+            frame_queue (queue.Queue): Queue filled by the capture stage.
+            detection_queue (queue.Queue): Bounded queue (FRAME_QUEUE_SIZE) for the effects loop.
+            stop_event (threading.Event): Set by the processing loop to stop this worker.
+        """
+        try:
+            while not stop_event.is_set():
+                try:
+                    frame = frame_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if frame is None:
+                    return
+
+                if self._last_detection is None or self._frame_counter % self.inference_interval == 0:
+                    results, frame, all_faces_points, all_faces_lines = self.human_face_detector.process_frame(frame)
+                    # process_frame reuses its point/line buffers on the next call, which this thread
+                    # makes while the effects loop still works on these: keep copies (a few KB). The
+                    # copies are only read downstream, so skipped frames can share them.
+                    self._last_detection = (results,
+                                            [face_points.copy() for face_points in all_faces_points],
+                                            [face_lines.copy() for face_lines in all_faces_lines])
+                self._frame_counter += 1
+
+                results, all_faces_points, all_faces_lines = self._last_detection
+                detection = (results, frame, all_faces_points, all_faces_lines)
+                if not self._put_until_stopped(detection_queue, detection, stop_event):
+                    return
+        except Exception as e:
+            print(f"Digital Makeup: MainApplication: Face detection failed: {e}", file=sys.stderr)
+        finally:
+            # End-of-stream marker; a no-op once stop_event is set
+            self._put_until_stopped(detection_queue, None, stop_event)
 
     def run(self):
         """
@@ -55,7 +175,7 @@ class MainApplication:
                     fps=camera_handler.fps,
                     device_path=self.virtual_camera_path
                  ) as virtual_camera_emitter, \
-                 HumanFaceDetector(max_num_faces=self.max_num_faces) as human_face_detector, \
+                 HumanFaceDetector(max_num_faces=self.max_num_faces, detection_scale=self.inference_scale) as human_face_detector, \
                  EdgeDetector() as edge_detector, \
                  MaskDetector() as mask_detector, \
                  DigitalFilters() as digital_filters_instance:
@@ -68,69 +188,99 @@ class MainApplication:
                 self.digital_filters = digital_filters_instance
 
                 print("Digital Makeup: MainApplication: Streaming with targeted blur started. Check your virtual camera app.")
-                
-                while True:
-                    ret, frame = self.camera_handler.read_frame()
-                    if not ret:
-                        print("Digital Makeup: MainApplication: Failed to read frame, exiting loop.", file=sys.stderr)
-                        break
-                    
-                    # 1. Process the frame for human face detection
-                    results, processed_frame, all_faces_points, all_faces_lines = self.human_face_detector.process_frame(frame)
-
-                    # 2. Extract and visualize general edges from face regions
-                    face_edges_visual = self.edge_detector.extract_face_edges(processed_frame, all_faces_points, edge_color=(0, 255, 0)) # Green edges
-
-                    # 3. Create the general binary face mask
-                    face_mask_binary = self.mask_detector.create_face_mask(processed_frame.shape, all_faces_points)
-                    
-                    # 4. Create the binary mask for areas around ALL general edges (red overlay)
-                    general_edge_roi_mask = self.mask_detector.create_edge_roi_mask(
-                        processed_frame.shape, 
-                        face_edges_visual, 
-                        dilation_kernel_size=7, 
-                        apply_general_face_mask=face_mask_binary 
-                    )
-
-                    # 5. Create the binary mask specifically for nasolabial lines (cyan overlay)
-                    nasolabial_mask = self.mask_detector.create_nasolabial_mask(
-                        processed_frame.shape, 
-                        all_faces_points, 
-                        dilation_kernel_size=7, 
-                        apply_general_face_mask=face_mask_binary 
-                    )
-
-                    # --- Apply Digital Makeup Effects ---
-                    image_with_makeup = processed_frame
-
-                    # Apply Gaussian Blur to the nasolabial mask area first (STRONG BLUR FOR TESTING)
-                    image_with_makeup = self.digital_filters.apply_targeted_blur(
-                        image_with_makeup, 
-                        nasolabial_mask, 
-                        kernel_size=(75, 75), 
-                        alpha=1.0
-                    )
-
-                    # --- Visualization (drawn on image_with_makeup) ---
-                    final_frame = image_with_makeup
-                    
-                    # Draw face mesh (points and lines) on top
-                    #final_frame = draw_face_mesh_overlay(final_frame, results, all_faces_points, all_faces_lines)
-                    
-                    # Composite the detected general face edges onto the frame
-                    #final_frame = composite_images(final_frame, face_edges_visual)
-
-                    # Draw the semi-transparent general face mask overlay (blue)
-                    #final_frame = draw_face_mask_overlay(final_frame, face_mask_binary, mask_color=(255, 0, 0), alpha=0.3)
-                    
-                    # Draw the semi-transparent general edge ROI mask overlay (red)
-                    #final_frame = draw_face_mask_overlay(final_frame, general_edge_roi_mask, mask_color=(0, 0, 255), alpha=0.5) 
-                    
-                    # Draw the semi-transparent NASOLABIAL mask overlay (CYAN)
-                    #final_frame = draw_face_mask_overlay(final_frame, nasolabial_mask, mask_color=(255, 255, 0), alpha=0.3) 
-
-                    # Send the final processed frame to the virtual camera
-                    self.virtual_camera_emitter.send_frame(final_frame)
+
+                # Pipelined stages: capture and face detection run on their own threads
+                # (cv2 and MediaPipe release the GIL), masks + blur run here and the virtual
+                # camera sends from its own emit thread, so each frame costs the slowest stage
+                # instead of the sum of all of them
+                frame_queue = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+                detection_queue = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+                stop_event = threading.Event()
+                pipeline_threads = [
+                    threading.Thread(target=self._capture_worker, args=(frame_queue, stop_event),
+                                     name="capture", daemon=True),
+                    threading.Thread(target=self._detection_worker, args=(frame_queue, detection_queue, stop_event),
+                                     name="detection", daemon=True),
+                ]
+                for thread in pipeline_threads:
+                    thread.start()
+
+                try:
+                    while True:
+                        detection = detection_queue.get()
+                        if detection is None:
+                            print("Digital Makeup: MainApplication: Failed to read frame, exiting loop.", file=sys.stderr)
+                            break
+
+                        # 1. Human face detection results (computed by the detection stage)
+                        results, processed_frame, all_faces_points, all_faces_lines = detection
+
+                        if not all_faces_points:
+                            # No face: every mask below would be empty and the blur a no-op,
+                            # so skip straight to sending the frame as captured
+                            self.virtual_camera_emitter.send_frame(processed_frame)
+                            continue
+
+                        # 2. Extract and visualize general edges from face regions
+                        # Canny at half resolution: these edges only seed the general ROI mask
+                        face_edges_visual = self.edge_detector.extract_face_edges(processed_frame, all_faces_points, edge_color=(0, 255, 0), # Green edges
+                                                                                  detection_scale=0.5)
+
+                        # 3. Create the general binary face mask
+                        face_mask_binary = self.mask_detector.create_face_mask(processed_frame.shape, all_faces_points)
+
+                        # 4. Create the binary mask for areas around ALL general edges (red overlay)
+                        general_edge_roi_mask = self.mask_detector.create_edge_roi_mask(
+                            processed_frame.shape, 
+                            face_edges_visual, 
+                            dilation_kernel_size=MASK_DILATION_KERNEL_SIZE, 
+                            apply_general_face_mask=face_mask_binary 
+                        )
+
+                        # 5. Create the binary mask specifically for nasolabial lines (cyan overlay)
+                        nasolabial_mask = self.mask_detector.create_nasolabial_mask(
+                            processed_frame.shape, 
+                            all_faces_points, 
+                            dilation_kernel_size=MASK_DILATION_KERNEL_SIZE, 
+                            apply_general_face_mask=face_mask_binary 
+                        )
+
+                        # --- Apply Digital Makeup Effects ---
+                        image_with_makeup = processed_frame
+
+                        # Apply Gaussian Blur to the nasolabial mask area first (STRONG BLUR FOR TESTING)
+                        image_with_makeup = self.digital_filters.apply_targeted_blur(
+                            image_with_makeup, 
+                            nasolabial_mask, 
+                            kernel_size=NASOLABIAL_BLUR_KERNEL_SIZE, 
+                            alpha=NASOLABIAL_BLUR_ALPHA
+                        )
+
+                        # --- Visualization (drawn on image_with_makeup) ---
+                        final_frame = image_with_makeup
+
+                        # Draw face mesh (points and lines) on top
+                        #final_frame = draw_face_mesh_overlay(final_frame, results, all_faces_points, all_faces_lines)
+
+                        # Composite the detected general face edges onto the frame
+                        #final_frame = composite_images(final_frame, face_edges_visual)
+
+                        # Draw the semi-transparent general face mask overlay (blue)
+                        #final_frame = draw_face_mask_overlay(final_frame, face_mask_binary, mask_color=(255, 0, 0), alpha=0.3)
+
+                        # Draw the semi-transparent general edge ROI mask overlay (red)
+                        #final_frame = draw_face_mask_overlay(final_frame, general_edge_roi_mask, mask_color=(0, 0, 255), alpha=0.5) 
+
+                        # Draw the semi-transparent NASOLABIAL mask overlay (CYAN)
+                        #final_frame = draw_face_mask_overlay(final_frame, nasolabial_mask, mask_color=(255, 255, 0), alpha=0.3) 
+
+                        # Send the final processed frame to the virtual camera
+                        self.virtual_camera_emitter.send_frame(final_frame)
+                finally:
+                    # Stop and join the pipeline threads before the camera and detector are released
+                    stop_event.set()
+                    for thread in pipeline_threads:
+                        thread.join()
                         
         except IOError as e:
             print(f"\n--- Digital Makeup: MainApplication - Troubleshooting FAILED (IOError) ---", file=sys.stderr)
@@ -176,11 +326,28 @@ if __name__ == "__main__":
         help="Maximum number of faces to detect for MediaPipe Face Mesh."
     )
 
+    parser.add_argument(
+        "--inference-scale",
+        type=float,
+        default=DEFAULT_INFERENCE_SCALE,
+        help="Scale of the frame MediaPipe Face Mesh runs on (1.0 = full resolution). "
+             "Landmarks are normalized, so they still map onto the full-size frame."
+    )
+
+    parser.add_argument(
+        "--inference-interval",
+        type=int,
+        default=DEFAULT_INFERENCE_INTERVAL,
+        help="Run Face Mesh on every Nth frame only; the frames in between reuse the last landmarks."
+    )
+
     args = parser.parse_args()
 
     app = MainApplication(
         camera_index=args.camera_index, 
         virtual_camera_path=args.virtual_camera_path,
-        max_num_faces=args.max_num_faces
+        max_num_faces=args.max_num_faces,
+        inference_scale=args.inference_scale,
+        inference_interval=args.inference_interval
     )
     app.run()
\ No newline at end of file
@@ -3,6 +3,15 @@ import cv2
 import numpy as np
 import mediapipe as mp 
 
+# MediaPipe indices for approximate nasolabial fold paths (left and right)
+# These are empirical and can be fine-tuned based on visual inspection.
+NASOLABIAL_PATHS_INDICES = (
+    # Right fold (viewer's left side of face) - approximate path
+    (203, 206, 216, 212, 186, 92, 64, 129),
+    # Left fold (viewer's right side of face) - approximate path
+    (294, 423, 426, 436, 287, 410, 294, 478),
+)
+
 class MaskDetector:
     def __init__(self):
         """
@@ -43,7 +52,7 @@ class MaskDetector:
             return mask 
 
         for face_points in face_points_list:
-            if not face_points:
+            if len(face_points) == 0:
                 continue
 
             points_np = np.array(face_points, dtype=np.int32)
@@ -73,7 +82,9 @@ class MaskDetector:
         h, w, _ = image_shape
         edge_roi_mask = np.zeros((h, w), dtype=np.uint8)
 
-        if face_edges_visual is None or np.all(face_edges_visual == 0):
+        # countNonZero scans the bytes in one SIMD pass without building an (H, W, 3) bool
+        # array; it takes a single channel, so view the BGR image as (H, W * 3)
+        if face_edges_visual is None or cv2.countNonZero(face_edges_visual.reshape(face_edges_visual.shape[0], -1)) == 0:
             return edge_roi_mask 
 
         gray_edges = cv2.cvtColor(face_edges_visual, cv2.COLOR_BGR2GRAY)
@@ -103,7 +114,8 @@ class MaskDetector:
             all_faces_points (list[list[tuple[int, int]]]): A list of lists, where each inner list
                                                             contains (x, y) pixel coordinates
                                                             for all landmarks of a single detected face.
-            dilation_kernel_size (int): Size of the kernel for dilation to thicken the lines.
+            dilation_kernel_size (int): Thickness the lines are drawn with (the size of the
+                                        dilation they replace).
             apply_general_face_mask (cv2.Mat | None): An optional general face mask (binary) to
                                                        confine the nasolabial ROIs strictly to the face.
 
@@ -116,36 +128,21 @@ class MaskDetector:
         if not all_faces_points:
             return combined_nasolabial_mask # Return empty if no faces
 
-        # Define MediaPipe indices for approximate nasolabial fold paths (left and right)
-        # These are empirical and can be fine-tuned based on visual inspection.
-        nasolabial_paths_indices = [
-            # Right fold (viewer's left side of face) - approximate path
-            [203,206,216,212,186,92,64,129], 
-            # Left fold (viewer's right side of face) - approximate path
-            [294,423,426,436,287,410,294,478],     
-        ]
-        
+        # Every path of every face is drawn straight into the one combined mask, already
+        # thickened: a thick polyline stands in for a 1 px line dilated by a square kernel
+        # (round instead of square ends and joins), so no dilation pass is needed at all
         for face_points in all_faces_points:
-            if not face_points:
+            if len(face_points) == 0:
                 continue # Skip if an individual face has no points
 
-            current_face_mask = np.zeros((h, w), dtype=np.uint8) # Mask for current face's nasolabial lines
-            points_np = np.array(face_points, dtype=np.int32)
+            points_np = np.asarray(face_points, dtype=np.int32)
 
-            for path_indices in nasolabial_paths_indices:
-                current_path_points = [points_np[idx] for idx in path_indices if idx < len(points_np)]
+            for path_indices in NASOLABIAL_PATHS_INDICES:
+                current_path_points = points_np[[idx for idx in path_indices if idx < len(points_np)]]
                 
                 if len(current_path_points) > 1: # Need at least 2 points for a line
-                    temp_mask_for_line = np.zeros((h, w), dtype=np.uint8)
-                    cv2.polylines(temp_mask_for_line, [np.array(current_path_points)], isClosed=False, color=255, thickness=1)
-
-                    kernel = np.ones((dilation_kernel_size, dilation_kernel_size), np.uint8)
-                    dilated_line = cv2.dilate(temp_mask_for_line, kernel, iterations=1)
-                    
-                    current_face_mask = cv2.bitwise_or(current_face_mask, dilated_line)
-            
-            # Combine individual face nasolabial masks into the overall mask
-            combined_nasolabial_mask = cv2.bitwise_or(combined_nasolabial_mask, current_face_mask)
+                    cv2.polylines(combined_nasolabial_mask, [current_path_points], isClosed=False, color=255,
+                                  thickness=dilation_kernel_size, lineType=cv2.LINE_8)
 
         # Apply the general face mask to ensure ROIs are confined to the face
         if apply_general_face_mask is not None:
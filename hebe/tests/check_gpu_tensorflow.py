@@ -1,13 +1,17 @@
 # --- check gpu under Tnesorflow
-import tensorflow as tf
-
-gpus = tf.config.list_physical_devices('GPU')
-if gpus:
-    print("GPU(s) found:")
-    for gpu in gpus:
-        print(f" {gpu.name}")
-else:
-    print("No GPU detected under Tensorflow")
+def check_tensorflow_gpus():
+    # Imported here, not at module level: loading TensorFlow takes seconds and
+    # hundreds of MB, so importing this file alone should not pay for it
+    import tensorflow as tf
 
+    gpus = tf.config.list_physical_devices('GPU')
+    if gpus:
+        print("GPU(s) found:")
+        for gpu in gpus:
+            print(f" {gpu.name}")
+    else:
+        print("No GPU detected under Tensorflow")
 
 
+if __name__ == "__main__":
+    check_tensorflow_gpus()
@@ -1,7 +1,40 @@
+import asyncio
+import logging
+from functools import lru_cache
 import cv2
 import mediapipe as mp
 import numpy as np
-from skimage.feature import hessian_matrix, hessian_matrix_eigvals
+
+# Face-mesh landmark indices around each nasolabial fold, sorted and deduplicated once.
+# All are below 468, the landmark count every face is checked against in the loop.
+RIGHT_NASOLABIAL_INDICES = np.array(sorted({64, 49, 131, 36, 203, 206, 205, 207, 216}), dtype=np.intp)
+LEFT_NASOLABIAL_INDICES = np.array(sorted({371, 279, 266, 423, 425, 426, 427, 436, 432}), dtype=np.intp)
+# Both regions go through the same wrinkle detection, one after the other in a single loop
+NASOLABIAL_REGIONS = (("Right Nasolabial", RIGHT_NASOLABIAL_INDICES),
+                      ("Left Nasolabial", LEFT_NASOLABIAL_INDICES))
+
+# Closing for the wrinkle mask: three 7x7 MORPH_CLOSE iterations (dilate x3, erode x3) equal
+# a single close with the composed 19x19 square, built once here instead of every frame
+CLOSE_KERNEL = np.ones((19, 19), np.uint8)
+# The close only changes pixels within 2 * its radius of the drawn contours
+CLOSE_PADDING = 2 * (CLOSE_KERNEL.shape[0] // 2)
+
+# Face Mesh runs on a copy scaled by this factor; its landmarks are normalized to [0, 1],
+# so they are scaled by the full frame size afterwards exactly as before
+INFERENCE_SCALE = 0.5
+
+@lru_cache(maxsize=None)
+def hessian_smoothing_kernel(sigma):
+    # The 1D kernel cv2.GaussianBlur derives for a float image and ksize (0, 0) -- size
+    # round(8 * sigma + 1), forced odd -- built once per sigma instead of on every call
+    return cv2.getGaussianKernel(int(round(sigma * 8 + 1)) | 1, sigma, cv2.CV_32F)
+
+# Per-frame diagnostics go through this logger so they cost nothing unless DEBUG is enabled
+logger = logging.getLogger(__name__)
+
+# Tessellation edges as an (N, 2) landmark index array, so the debug mesh is drawn with one
+# polylines call instead of draw_landmarks' per-edge Python loop
+FACE_MESH_TESSELATION = np.array(sorted(mp.solutions.face_mesh.FACEMESH_TESSELATION), dtype=np.intp)
 
 def smooth_nasolabial_lines_alpha_blend_test(): # The latest version with alpha blending
     mp_face_mesh = mp.solutions.face_mesh
@@ -10,7 +43,7 @@ def smooth_nasolabial_lines_alpha_blend_test(): # The latest version with alpha
 
     face_mesh = mp_face_mesh.FaceMesh(static_image_mode=False,
                                       max_num_faces=1,
-                                      refine_landmarks=True,
+                                      refine_landmarks=False, # iris landmarks (468+) are never used
                                       min_detection_confidence=0.5,
                                       min_tracking_confidence=0.5)
 
@@ -20,6 +53,11 @@ def smooth_nasolabial_lines_alpha_blend_test(): # The latest version with alpha
         print("Error: Could not open video stream.")
         return
 
+    # Same capture settings as CameraHandler: MJPG from the device and a single driver
+    # buffer, so cap.read returns the newest frame instead of a stale queued one
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
     print("Press 'q' to quit.")
     print("ALPHA BLENDING TEST: Blending blurred region with original for smoother look.")
     print(">>>> IMPORTANT: Ensure consistent face detection for the effect to apply.")
@@ -48,13 +86,23 @@ def smooth_nasolabial_lines_alpha_blend_test(): # The latest version with alpha
     cv2.resizeWindow(overlay_debug_window_name, target_width // 2, target_height // 2)
 
     drawing_spec = mp_drawing.DrawingSpec(thickness=1, circle_radius=1)
+    tesselation_style = mp_drawing_styles.get_default_face_mesh_tesselation_style()
+
+    # Smoothing blur: separable 51x51 Gaussian, its 1D kernel built once instead of every frame
+    kernel_size = (51, 51)
+    blur_kernel = cv2.getGaussianKernel(kernel_size[0], 0)
+
+    # Polygon mask + padded box per region, reused while the landmarks only jitter: their
+    # frame-to-frame motion is usually sub-pixel, which does not change the ROI meaningfully
+    roi_mask_cache = {}
+    roi_mask_reuse_threshold = 1.5 # mean absolute landmark motion, in pixels
 
     def process_roi_and_mask(region_name, roi_points, sigma_val, draw_color, padding=1, min_contour_area=15):
         # Local variables to be accessed from the main loop's scope
         nonlocal gray_frame, debug_detection_frame, img_w, img_h
 
         if len(roi_points) < 3:
-            return np.zeros_like(gray_frame, dtype=np.uint8) 
+            return None # nothing to OR into the combined mask
 
         (x_base, y_base, w_base, h_base) = cv2.boundingRect(roi_points)
         x_base = max(0, x_base)
@@ -71,134 +119,251 @@ def smooth_nasolabial_lines_alpha_blend_test(): # The latest version with alpha
         h_final = y2 - y1
 
         if w_final <= 0 or h_final <= 0:
-            return np.zeros_like(gray_frame, dtype=np.uint8)
+            return None
 
         cv2.polylines(debug_detection_frame, [roi_points], True, draw_color, 3) 
         if roi_points.size > 0:
             text_x, text_y = x_base, y_base 
             cv2.putText(debug_detection_frame, region_name, (text_x, text_y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, draw_color, 2)
 
-        mask_poly = np.zeros_like(gray_frame, dtype=np.uint8)
-        cv2.fillPoly(mask_poly, [roi_points], 255) 
-        masked_region = cv2.bitwise_and(gray_frame, gray_frame, mask=mask_poly)
-        roi_cropped = masked_region[y1:y2, x1:x2]
+        cached = roi_mask_cache.get(region_name)
+        if (cached is not None and cached[0].shape == roi_points.shape and cached[1] == gray_frame.shape
+                and np.mean(np.abs(roi_points - cached[0])) < roi_mask_reuse_threshold):
+            # Reuse the previous polygon and the box it was cropped with, keeping both consistent
+            _, _, (x1, y1, x2, y2), mask_poly = cached
+        else:
+            # Polygon mask of the padded box only, in box coordinates
+            mask_poly = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+            cv2.fillPoly(mask_poly, [roi_points - (x1, y1)], 255) 
+            roi_mask_cache[region_name] = (roi_points, gray_frame.shape, (x1, y1, x2, y2), mask_poly)
+        # Crop first, then mask the crop: same pixels as masking the whole frame and cropping
+        gray_crop = gray_frame[y1:y2, x1:x2]
+        roi_cropped = cv2.bitwise_and(gray_crop, gray_crop, mask=mask_poly)
         
         if roi_cropped.shape[0] == 0 or roi_cropped.shape[1] == 0:
-            return np.zeros_like(gray_frame, dtype=np.uint8)
-
-        H_elems = hessian_matrix(roi_cropped, sigma=sigma_val)
-        _, eigenvalues = hessian_matrix_eigvals(H_elems)
-        wrinkles_mask_region = (eigenvalues < 0).astype(np.uint8) * 255 
-
-        current_region_mask = np.zeros_like(gray_frame, dtype=np.uint8)
+            return None
+
+        # Hessian with OpenCV: Gaussian smoothing, then second-order Sobel derivatives.
+        # Zero border, like skimage's hessian_matrix (mode='constant').
+        smoothing_kernel = hessian_smoothing_kernel(sigma_val)
+        roi_smoothed = cv2.sepFilter2D(roi_cropped, cv2.CV_32F, smoothing_kernel, smoothing_kernel, borderType=cv2.BORDER_CONSTANT)
+        Hrr = cv2.Sobel(roi_smoothed, cv2.CV_32F, 0, 2, ksize=3) # d2/dy2 (rows)
+        Hrc = cv2.Sobel(roi_smoothed, cv2.CV_32F, 1, 1, ksize=3) # d2/dxdy
+        Hcc = cv2.Sobel(roi_smoothed, cv2.CV_32F, 2, 0, ksize=3) # d2/dx2 (cols)
+        # Smaller eigenvalue of the 2x2 Hessian in closed form:
+        #   min_eig = (tr - sqrt(tr^2 - 4*det)) / 2,  tr = Hrr + Hcc,  det = Hrr*Hcc - Hrc^2
+        # Only its sign matters: min_eig < 0  <=>  tr < 0  or  det < 0, so no sqrt is needed
+        wrinkles_mask_region = (((Hrr + Hcc) < 0) | (Hrr * Hcc < Hrc * Hrc)).astype(np.uint8) * 255 
+
+        # The contours all lie in the padded ROI box, and the close only reaches CLOSE_PADDING
+        # beyond them: the region mask covers just that area, not the whole frame
+        cx0, cy0 = max(x1 - CLOSE_PADDING, 0), max(y1 - CLOSE_PADDING, 0)
+        cx1, cy1 = min(x2 + CLOSE_PADDING, img_w), min(y2 + CLOSE_PADDING, img_h)
+        current_region_mask = np.zeros((cy1 - cy0, cx1 - cx0), dtype=np.uint8)
 
         contours, _ = cv2.findContours(wrinkles_mask_region, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         for contour in contours:
             if cv2.contourArea(contour) > min_contour_area:
-                contour_offset = contour + (x1, y1)
-                cv2.drawContours(debug_detection_frame, [contour_offset], -1, draw_color, 1) 
-                cv2.drawContours(current_region_mask, [contour_offset], -1, 255, -1) 
-
-        kernel = np.ones((7,7), np.uint8) 
-        current_region_mask = cv2.morphologyEx(current_region_mask, cv2.MORPH_CLOSE, kernel, iterations=3) 
-
-        return current_region_mask
-
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            print("Error: Could not read frame.")
-            break
-
-        aspect_ratio = frame.shape[1] / frame.shape[0] 
+                cv2.drawContours(debug_detection_frame, [contour + (x1, y1)], -1, draw_color, 1) 
+                cv2.drawContours(current_region_mask, [contour + (x1 - cx0, y1 - cy0)], -1, 255, -1) 
+
+        cv2.morphologyEx(current_region_mask, cv2.MORPH_CLOSE, CLOSE_KERNEL, dst=current_region_mask)
+
+        # Top-left corner of the region mask in frame coordinates, and the mask itself
+        return (cx0, cy0), current_region_mask
+
+
+    # --- Capture -> inference pipeline ---
+    # cap.read and face_mesh.process release the GIL, so they run on executor threads
+    # while the main thread blends and displays the previous frame. The bounded queues
+    # give back-pressure so the camera cannot run ahead of the detector.
+    # HighGUI (imshow/waitKey) must stay on the main thread, which drives the loop.
+    loop = asyncio.new_event_loop()
+    captured_frames = asyncio.Queue(maxsize=2)
+    detected_frames = asyncio.Queue(maxsize=2)
+
+    # Stage-local working buffers, reused across frames instead of reallocated each time.
+    # Only the flipped frame travels through the queues, so it stays a fresh array.
+    # imshow copies what it displays, so display frames can live in these buffers too.
+    frame_buffers = {}
+
+    def frame_buffer(name, shape, dtype=np.uint8):
+        buffer = frame_buffers.get(name)
+        if buffer is None or buffer.shape != shape: # (re)allocate on first use or size change
+            buffer = frame_buffers[name] = np.empty(shape, dtype=dtype)
+        return buffer
+
+    @lru_cache(maxsize=None)
+    def resize_plan(frame_w, frame_h):
+        # Fit the frame into target_width x target_height keeping its aspect ratio. Cached per
+        # frame size, so this runs once instead of every frame. None means no resize is needed.
+        aspect_ratio = frame_w / frame_h 
         if aspect_ratio > target_width / target_height: 
             new_width = target_width
             new_height = int(target_width / aspect_ratio)
         else: 
             new_height = target_height
             new_width = int(target_height * aspect_ratio)
-            
-        frame = cv2.resize(frame, (new_width, new_height))
+
+        if (new_width, new_height) == (frame_w, frame_h):
+            return None
+        interpolation = cv2.INTER_AREA if new_width < frame_w else cv2.INTER_LINEAR # AREA for downscaling
+        return (new_width, new_height), interpolation
+
+    def read_and_prepare_frame():
+        ret, frame = cap.read()
+        if not ret:
+            return None
+
+        plan = resize_plan(frame.shape[1], frame.shape[0])
+        if plan is not None:
+            (new_width, new_height), interpolation = plan
+            frame = cv2.resize(frame, (new_width, new_height), dst=frame_buffer('resized', (new_height, new_width, 3)),
+                               interpolation=interpolation)
         
-        frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return cv2.flip(frame, 1)
+
+    def detect_landmarks(frame):
+        detection_frame = frame
+        if INFERENCE_SCALE < 1.0:
+            small_w = max(1, round(frame.shape[1] * INFERENCE_SCALE))
+            small_h = max(1, round(frame.shape[0] * INFERENCE_SCALE))
+            detection_frame = cv2.resize(frame, (small_w, small_h), dst=frame_buffer('small', (small_h, small_w, 3)),
+                                         interpolation=cv2.INTER_AREA)
+        rgb_frame = cv2.cvtColor(detection_frame, cv2.COLOR_BGR2RGB, dst=frame_buffer('rgb', detection_frame.shape))
 
         rgb_frame.flags.writeable = False 
         results = face_mesh.process(rgb_frame)
         rgb_frame.flags.writeable = True 
+        # MediaPipe only reads the RGB copy: hand back the untouched BGR frame for drawing
+        return frame, results
+
+    # A failing stage logs the error and still passes the None end marker downstream, so
+    # the main loop stops instead of waiting forever. Cancellation at shutdown is not an
+    # Exception, so it never blocks on putting the marker into a full queue.
+    async def capture_stage():
+        try:
+            while True:
+                frame = await loop.run_in_executor(None, read_and_prepare_frame)
+                await captured_frames.put(frame)
+                if frame is None:
+                    return
+        except Exception:
+            logger.exception("Capture stage failed.")
+            await captured_frames.put(None)
+
+    async def detection_stage():
+        try:
+            while True:
+                frame = await captured_frames.get()
+                if frame is None:
+                    await detected_frames.put(None)
+                    return
+                await detected_frames.put(await loop.run_in_executor(None, detect_landmarks, frame))
+        except Exception:
+            logger.exception("Detection stage failed.")
+            await detected_frames.put(None)
+
+    pipeline_tasks = [loop.create_task(capture_stage()), loop.create_task(detection_stage())]
 
-        original_frame_for_blend = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR).copy() 
-        frame_bgr = original_frame_for_blend.copy() 
-        debug_detection_frame = frame_bgr.copy() 
-        gray_frame = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+    while True:
+        detected = loop.run_until_complete(detected_frames.get())
+        if detected is None:
+            print("Error: Could not read frame.")
+            break
+        frame_bgr, results = detected
+
+        # Already BGR, no RGB->BGR round-trip. Never written in place: frame_bgr is only
+        # rebound to the blended result, and drawing goes to the copies below.
+        original_frame_for_blend = frame_bgr
+        debug_detection_frame = frame_buffer('debug', frame_bgr.shape)
+        np.copyto(debug_detection_frame, frame_bgr)
+        gray_frame = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY, dst=frame_buffer('gray', frame_bgr.shape[:2]))
 
         img_h, img_w, _ = frame_bgr.shape 
 
-        nasolabial_lines_mask = np.zeros((img_h, img_w), dtype=np.uint8)
+        nasolabial_lines_mask = frame_buffer('nasolabial_mask', (img_h, img_w))
+        nasolabial_lines_mask.fill(0) # regions are OR-ed in below
         
         if results.multi_face_landmarks: # This is the crucial condition!
             for face_landmarks in results.multi_face_landmarks:
                 if len(face_landmarks.landmark) < 468:
                     continue 
 
-                landmarks_px = []
-                for lm in face_landmarks.landmark:
-                    x, y = int(lm.x * img_w), int(lm.y * img_h)
-                    landmarks_px.append((x, y))
-                landmarks_px = np.array(landmarks_px)
-
-                mp_drawing.draw_landmarks(
-                    image=debug_detection_frame, 
-                    landmark_list=face_landmarks,
-                    connections=mp_face_mesh.FACEMESH_TESSELATION, 
-                    landmark_drawing_spec=drawing_spec,
-                    connection_drawing_spec=mp_drawing_styles.get_default_face_mesh_tesselation_style())
-
-                right_nasolabial_indices = sorted(list(set([64, 49, 131, 36, 203, 206, 205, 207, 216])))
-                right_nasolabial_pts = np.array([landmarks_px[i] for i in right_nasolabial_indices if i < len(landmarks_px)], dtype=np.int32)
-                
-                current_mask = process_roi_and_mask("Right Nasolabial", right_nasolabial_pts, sigma_val=1.5, draw_color=(255, 0, 255), padding=1, min_contour_area=15) 
-                if current_mask is not None:
-                    nasolabial_lines_mask = cv2.bitwise_or(nasolabial_lines_mask, current_mask)
-
-
-                left_nasolabial_indices = sorted(list(set([371, 279, 266, 423, 425, 426, 427, 436, 432]))) 
-                left_nasolabial_pts = np.array([landmarks_px[i] for i in left_nasolabial_indices if i < len(landmarks_px)], dtype=np.int32)
-                
-                current_mask = process_roi_and_mask("Left Nasolabial", left_nasolabial_pts, sigma_val=1.5, draw_color=(255, 0, 255), padding=1, min_contour_area=15) 
-                if current_mask is not None:
-                    nasolabial_lines_mask = cv2.bitwise_or(nasolabial_lines_mask, current_mask)
+                # All landmarks to pixels in one vector op instead of a ~478-step Python loop
+                # (astype truncates toward zero, like int())
+                landmarks = face_landmarks.landmark
+                landmarks_xy = np.fromiter((v for lm in landmarks for v in (lm.x, lm.y)),
+                                           dtype=np.float64, count=2 * len(landmarks)).reshape(-1, 2)
+                np.multiply(landmarks_xy, (img_w, img_h), out=landmarks_xy)
+                landmarks_px = frame_buffer('landmarks_px', landmarks_xy.shape, np.int32)
+                np.copyto(landmarks_px, landmarks_xy, casting='unsafe')
+
+                # Mesh overlay in two batched calls, using the tesselation and landmark colors and
+                # sizes: all edges as 2-point open polylines, then every landmark as a zero-length
+                # segment whose thickness makes it a dot. Unlike draw_landmarks, dots get no white
+                # border, and off-frame landmarks are not skipped (OpenCV clips them)
+                cv2.polylines(debug_detection_frame, landmarks_px[FACE_MESH_TESSELATION], False,
+                              tesselation_style.color, tesselation_style.thickness)
+                landmark_dots = landmarks_px[:, None, :].repeat(2, axis=1)
+                cv2.polylines(debug_detection_frame, landmark_dots, False,
+                              drawing_spec.color, 2 * drawing_spec.circle_radius)
+
+                for region_name, region_indices in NASOLABIAL_REGIONS:
+                    region_pts = landmarks_px[region_indices]
+
+                    current_mask = process_roi_and_mask(region_name, region_pts, sigma_val=1.5, draw_color=(255, 0, 255), padding=1, min_contour_area=15) 
+                    if current_mask is not None:
+                        # OR the region mask into its own box of the combined mask, in place
+                        (mask_x, mask_y), region_mask = current_mask
+                        mask_target = nasolabial_lines_mask[mask_y:mask_y + region_mask.shape[0], mask_x:mask_x + region_mask.shape[1]]
+                        cv2.bitwise_or(mask_target, region_mask, dst=mask_target)
 
                 cv2.imshow(mask_debug_window_name, nasolabial_lines_mask)
 
-                frame_to_blur = original_frame_for_blend.copy(order='C') 
-                
-                print(f"\nBefore GaussianBlur: frame_to_blur shape={frame_to_blur.shape}, dtype={frame_to_blur.dtype}")
-                kernel_size = (51, 51) 
-                blurred_frame_copy = cv2.GaussianBlur(frame_to_blur, kernel_size, 0) 
-                print(f"After GaussianBlur: blurred_frame_copy shape={blurred_frame_copy.shape}, dtype={blurred_frame_copy.dtype}")
-                
-                cv2.imshow(blurred_debug_window_name, blurred_frame_copy)
-
-                if np.array_equal(frame_to_blur, blurred_frame_copy):
-                    print("CRITICAL: frame_to_blur and blurred_frame_copy are IDENTICAL. GaussianBlur is STILL not working on live frame data.")
+                # Only the mask's bounding box is blurred: outside the mask the blend keeps the
+                # original frame anyway. An empty mask has a 0x0 box.
+                x, y, w, h = cv2.boundingRect(nasolabial_lines_mask)
+                if w == 0 or h == 0:
+                    logger.debug("Nasolabial lines mask is entirely black, no blur applied to output.")
                 else:
-                    print("SUCCESS: blurred_frame_copy is different from original. GaussianBlur is working on live frame.")
+                    frame_to_blur = original_frame_for_blend
+
+                    logger.debug("Before blur: frame_to_blur shape=%s, dtype=%s", frame_to_blur.shape, frame_to_blur.dtype)
+                    # Pad the box by the kernel radius so pixels near its edge see the same
+                    # neighbourhood as a full-frame blur
+                    pad_x, pad_y = kernel_size[0] // 2, kernel_size[1] // 2
+                    x0, y0 = max(x - pad_x, 0), max(y - pad_y, 0)
+                    x1, y1 = min(x + w + pad_x, img_w), min(y + h + pad_y, img_h)
+                    blurred_frame_copy = frame_buffer('blurred', frame_to_blur.shape)
+                    np.copyto(blurred_frame_copy, frame_to_blur)
+                    blurred_frame_copy[y:y + h, x:x + w] = cv2.sepFilter2D(frame_to_blur[y0:y1, x0:x1], -1, blur_kernel, blur_kernel)[y - y0:y - y0 + h, x - x0:x - x0 + w]
+                    logger.debug("After blur: blurred_frame_copy shape=%s, dtype=%s", blurred_frame_copy.shape, blurred_frame_copy.dtype)
                     
-                    if np.any(nasolabial_lines_mask > 0):
-                        mask_3_channel = cv2.cvtColor(nasolabial_lines_mask, cv2.COLOR_GRAY2BGR)
-                        alpha = mask_3_channel.astype(float) / 255.0
-                        
-                        frame_bgr = (alpha * blurred_frame_copy.astype(float) + \
-                                     (1 - alpha) * original_frame_for_blend.astype(float)).astype(np.uint8)
+                    cv2.imshow(blurred_debug_window_name, blurred_frame_copy)
 
-                        print(f"Applying Alpha Blending with alpha based on mask.")
+                    if np.array_equal(frame_to_blur[y:y + h, x:x + w], blurred_frame_copy[y:y + h, x:x + w]):
+                        logger.error("CRITICAL: frame_to_blur and blurred_frame_copy are IDENTICAL. GaussianBlur is STILL not working on live frame data.")
+                    else:
+                        logger.debug("SUCCESS: blurred_frame_copy is different from original. GaussianBlur is working on live frame.")
+                    
+                        # Alpha blend with the mask as alpha. The mask is binary (contours filled
+                        # with 255, OR-ed and closed), so alpha 255 takes the blurred pixel and 0
+                        # keeps the original: a masked copy, bit-identical to the fixed-point blend
+                        # and with no uint16 intermediates. Only the mask's box can change.
+                        # The single-channel mask broadcasts over B, G, R, no GRAY2BGR copy needed.
+                        frame_bgr = frame_buffer('output', original_frame_for_blend.shape)
+                        np.copyto(frame_bgr, original_frame_for_blend)
+                        np.copyto(frame_bgr[y:y + h, x:x + w], blurred_frame_copy[y:y + h, x:x + w],
+                                  where=nasolabial_lines_mask[y:y + h, x:x + w, None] > 0)
+
+                        logger.debug("Applying Alpha Blending with alpha based on mask.")
 
                         mask_coords_rows, mask_coords_cols = np.where(nasolabial_lines_mask == 255)
                         if len(mask_coords_rows) > 0:
                             temp_overlay_color = [0, 255, 0] # Green
-                            frame_bgr_with_overlay = original_frame_for_blend.copy() 
+                            frame_bgr_with_overlay = frame_buffer('overlay', original_frame_for_blend.shape)
+                            np.copyto(frame_bgr_with_overlay, original_frame_for_blend)
                             frame_bgr_with_overlay[mask_coords_rows, mask_coords_cols] = temp_overlay_color
                             cv2.imshow(overlay_debug_window_name, frame_bgr_with_overlay)
                             cv2.waitKey(1) 
@@ -211,25 +376,23 @@ def smooth_nasolabial_lines_alpha_blend_test(): # The latest version with alpha
                             blurred_pixel_value = blurred_frame_copy[sample_row, sample_col]
                             blended_pixel_value = frame_bgr[sample_row, sample_col]
 
-                            print(f"Sample pixel ({sample_row}, {sample_col}):")
-                            print(f"  Original (from original_frame_for_blend): {original_pixel_value}")
-                            print(f"  Blurred (from blurred_frame_copy): {blurred_pixel_value}")
-                            print(f"  Blended (in final frame_bgr): {blended_pixel_value} (should be blend of original & blurred)")
+                            logger.debug("Sample pixel (%d, %d):", sample_row, sample_col)
+                            logger.debug("  Original (from original_frame_for_blend): %s", original_pixel_value)
+                            logger.debug("  Blurred (from blurred_frame_copy): %s", blurred_pixel_value)
+                            logger.debug("  Blended (in final frame_bgr): %s (should be blend of original & blurred)", blended_pixel_value)
                             
                             if np.array_equal(blended_pixel_value, original_pixel_value) and \
                                not np.array_equal(blended_pixel_value, blurred_pixel_value):
-                                print(f"DEBUG: Pixel at ({sample_row}, {sample_col}) in final frame_bgr is a blend.")
+                                logger.debug("Pixel at (%d, %d) in final frame_bgr is a blend.", sample_row, sample_col)
                             elif np.array_equal(blended_pixel_value, blurred_pixel_value):
-                                print(f"DEBUG: Pixel at ({sample_row}, {sample_col}) in final frame_bgr is fully blurred (alpha=1).")
+                                logger.debug("Pixel at (%d, %d) in final frame_bgr is fully blurred (alpha=1).", sample_row, sample_col)
                             else:
-                                print(f"CRITICAL: Blending issue at ({sample_row}, {sample_col}).")
+                                logger.error("CRITICAL: Blending issue at (%d, %d).", sample_row, sample_col)
 
                         else:
-                            print("Mask coordinates found, but list is empty. No pixel assignment (mask might be too small).")
-                    else:
-                        print("Warning: Nasolabial lines mask is entirely black, no blur applied to output.")
+                            logger.debug("Mask coordinates found, but list is empty. No pixel assignment (mask might be too small).")
         else:
-            print("No face landmarks detected. No processing for this frame.")
+            logger.debug("No face landmarks detected. No processing for this frame.")
 
 
         cv2.imshow(detection_debug_window_name, debug_detection_frame) 
@@ -238,9 +401,17 @@ def smooth_nasolabial_lines_alpha_blend_test(): # The latest version with alpha
         if cv2.waitKey(1) & 0xFF == ord('q'):
             break
 
+    for task in pipeline_tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pipeline_tasks, return_exceptions=True))
+    loop.run_until_complete(loop.shutdown_default_executor())
+    loop.close()
+
     face_mesh.close()
     cap.release()
     cv2.destroyAllWindows()
 
 if __name__ == "__main__":
+    # Per-frame diagnostics are DEBUG records: run with level=logging.DEBUG to see them
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     smooth_nasolabial_lines_alpha_blend_test()
\ No newline at end of file
@@ -1,11 +1,18 @@
 # virtual_camera_emitter.py
 import pyvirtualcam
+import cv2
 import numpy as np
 import subprocess
 import re
 import os
+import queue
+import threading
 import time # For diagnostic sleep
 
+# YUYV buffers cycled between send_frame and the emit thread: one being converted, one
+# waiting in the (single-slot) emit queue and one being sent
+EMIT_BUFFER_COUNT = 3
+
 class VirtualCameraEmitter:
     def __init__(self, width: int, height: int, fps: float, device_path: str = '/dev/video0'):
         """
@@ -22,6 +29,10 @@ class VirtualCameraEmitter:
         self.fps = fps
         self.device_path = device_path
         self.cam = None # pyvirtualcam.Camera instance
+        self._emit_queue = None # single-slot queue of YUYV frames for the emit thread
+        self._free_buffers = None # YUYV buffers not currently queued or being sent
+        self._emit_thread = None
+        self._emit_error = None # exception that stopped the emit thread, raised by send_frame
 
         print(f"Digital Makeup: VirtualCameraEmitter: Initializing for device '{self.device_path}' "
               f"at {self.width}x{self.height} @ {self.fps:.2f} FPS.")
@@ -102,11 +113,12 @@ class VirtualCameraEmitter:
                 width=self.width,
                 height=self.height,
                 fps=self.fps,
-                fmt=pyvirtualcam.PixelFormat.BGR, # Assuming OpenCV frames are BGR
+                # YUYV is what v4l2loopback consumers read: for BGR, pyvirtualcam would convert
+                # every frame itself; send_frame converts with OpenCV instead (2 bytes/pixel)
+                fmt=pyvirtualcam.PixelFormat.YUYV,
                 device=self.device_path
             )
             print(f"Digital Makeup: VirtualCameraEmitter: Virtual camera started successfully on {self.cam.device}.")
-            return self
         except Exception as e:
             # Provide more context for common pyvirtualcam errors
             error_message = (
@@ -117,26 +129,90 @@ class VirtualCameraEmitter:
             )
             raise IOError(error_message) from e
 
+        # Sending and the frame pacing sleep run on their own thread, so the caller's
+        # processing loop is never blocked on v4l2 I/O
+        self._emit_queue = queue.Queue(maxsize=1)
+        self._free_buffers = queue.Queue()
+        for _ in range(EMIT_BUFFER_COUNT):
+            self._free_buffers.put(None) # allocated on first use, at the frame's size
+        self._emit_error = None
+        self._emit_thread = threading.Thread(target=self._emit_worker, name="virtual-camera-emit", daemon=True)
+        self._emit_thread.start()
+        return self
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Context manager exit point: Releases the virtual camera.
+        Context manager exit point: Stops the emit thread and releases the virtual camera.
         """
+        if self._emit_thread:
+            # Drop any frame still waiting and wake the emit thread with the stop marker
+            try:
+                self._emit_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._emit_queue.put(None)
+            self._emit_thread.join()
+            self._emit_thread = None
         if self.cam:
             print("Digital Makeup: VirtualCameraEmitter: Releasing virtual camera.")
             self.cam.close()
         self.cam = None
 
+    def _emit_worker(self):
+        """
+        Emit thread: sends queued YUYV frames to the virtual camera, sleeping between them to
+        keep the reported FPS, and returns each buffer to the free pool once sent.
+        Stops when it receives None, or on the first error, which it keeps in _emit_error
+        for send_frame to raise.
+        """
+        while True:
+            yuyv_frame = self._emit_queue.get()
+            if yuyv_frame is None:
+                return
+            try:
+                self.cam.send(yuyv_frame)
+                # Sleep until the next frame is due to maintain consistent FPS
+                self.cam.sleep_until_next_frame()
+            except Exception as e:
+                print(f"Digital Makeup: VirtualCameraEmitter Error: Failed to send frame, stopping emit thread: {e}")
+                self._emit_error = e
+                return
+            finally:
+                self._free_buffers.put(yuyv_frame)
+
     def send_frame(self, frame: np.ndarray):
         """
-        Sends a NumPy array frame to the virtual camera.
+        Queues a NumPy array frame for the virtual camera and returns without waiting for it
+        to be sent. If the previous frame has not been picked up yet, it is dropped in favour
+        of this one, so the output never falls behind the camera.
 
         Args:
-            frame (np.ndarray): The frame to send. Must be a BGR NumPy array.
+            frame (np.ndarray): The frame to send. Must be a BGR NumPy array. It is converted
+                                into a buffer owned by the emitter, so the caller may reuse it
+                                as soon as this returns.
+
+        Raises:
+            IOError: If sending an earlier frame failed; the emit thread has stopped, so no
+                     further frames would reach the virtual camera.
         """
-        if self.cam:
-            # pyvirtualcam expects C-contiguous arrays. Ensure this for safety.
-            if not frame.flags['C_CONTIGUOUS']:
-                frame = np.ascontiguousarray(frame)
-            self.cam.send(frame)
-            # Sleep until the next frame is due to maintain consistent FPS
-            self.cam.sleep_until_next_frame()
\ No newline at end of file
+        if self._emit_error is not None:
+            raise IOError(
+                f"Digital Makeup: VirtualCameraEmitter Error: Could not send frames to {self.device_path}. "
+                f"Original error: '{self._emit_error}'."
+            ) from self._emit_error
+
+        if self.cam and self._emit_thread:
+            # Convert into a free C-contiguous (H, W, 2) YUYV buffer; cvtColor reads
+            # non-contiguous views directly, so no separate contiguous copy is needed
+            yuyv_frame = self._free_buffers.get_nowait() # one is always free, see EMIT_BUFFER_COUNT
+            if yuyv_frame is None or yuyv_frame.shape[:2] != frame.shape[:2]:
+                yuyv_frame = np.empty((frame.shape[0], frame.shape[1], 2), dtype=np.uint8)
+            cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_YUY2, dst=yuyv_frame)
+
+            # Only this method puts frames on the queue, so after taking the stale frame
+            # out the single slot is guaranteed to be free
+            try:
+                self._free_buffers.put(self._emit_queue.get_nowait())
+            except queue.Empty:
+                pass
+            self._emit_queue.put_nowait(yuyv_frame)
\ No newline at end of file